@@ -32,24 +32,44 @@ class CSP:
     X is a set of variables (X1, ... , Xn}
     D is a set of domains {D1, ... , Dn}, one for each variable.
     C is a set of constraints that specify allowable combinations of values.
+
+    Variables are numbered in the order they are added, and every distinct
+    value in any domain is numbered the first time it is seen. Internally a
+    domain is an int used as a bitset, with bit i set if value i is allowed,
+    so removing a value, testing for one and counting them are single integer
+    operations. The index methods below expose this to the solvers.
+
+    Domain reductions made while solving are recorded on a trail of (variable
+    index, old domain) pairs. A solver takes a mark before it narrows any
+    domains and restores the domains to that mark when it backtracks, which
+    costs time in proportion to the changes made since, not to the CSP's size.
     """
 
     def __init__(self, variables=None):
-        if variables is None:
-            variables = []
-        self.__variables = variables
-        self.__domains = []
+        self.__variables = []
+        self.__domains = []  # Variable index to bitset of value indexes
         self.__constraints = []
         self.__var_index_map = {}  # Variable to index map
         self.__constraint_network = {}  # Variable to constraint map
+        self.__values = []  # Value index to value
+        self.__value_index_map = {}  # Value to index map
+        self.__not_equal = []  # Variable index to indexes of variables it must differ from
+        self.__other_constraints = []  # Variable index to its constraints other than those
+        self.__empty = set()  # Indexes of variables with empty domains
+        self.__trail = []  # (variable index, domain bits) to restore, oldest first
+        if variables is not None:
+            for var in variables:
+                self._add_variable(var)
 
     def _add_variable(self, var):
         if var not in self.__var_index_map:
-            empty_domain = Domain()
             self.__variables.append(var)
-            self.__domains.append(empty_domain)
+            self.__domains.append(0)
             self.__var_index_map[var] = len(self.__variables)-1
             self.__constraint_network[var] = []
+            self.__not_equal.append([])
+            self.__other_constraints.append([])
+            self.__empty.add(len(self.__variables)-1)
         else:
             raise ValueError('Variable with same name already exists.')
 
@@ -61,29 +81,37 @@ class CSP:
 
     def get_domain(self, var):
         """Returns the Domain for a given variable"""
-        return self.__domains[self.__var_index_map[var]]
+        return Domain.from_bits(self.__values, self.__value_index_map,
+                                self.__domains[self.__var_index_map[var]])
 
     def set_domain(self, var, domain):
         """Sets the Domain for the given variable"""
-        self.__domains[self._index(var)] = domain
+        bits = 0
+        for value in domain:
+            bits |= 1 << self._intern_value(value)
+        self.set_domain_bits(self._index(var), bits)
 
     def remove_value_from_domain(self, var, value):
-        """Replaces the domain of the specified variable by new domain,
-        which contains all values of the old domain except the specified
-        value.
+        """Removes the specified value from the domain of the specified
+        variable. The Domain objects handed out before are not changed.
         """
-        current_domain = self.get_domain(var)
-        values = []
-        for item in current_domain:
-            if item != value:
-                values.append(item)
-        self.set_domain(var, Domain(values))
+        value_index = self.__value_index_map.get(value)
+        if value_index is not None:
+            self.remove_value_index(self._index(var), value_index)
 
     def add_constraint(self, constraint):
         """Add a constraint to the problem"""
         self.__constraints.append(constraint)
         for var in constraint.get_scope():
             self.__constraint_network[var].append(constraint)
+        scope = constraint.get_scope()
+        if isinstance(constraint, NotEqualConstraint):
+            (i, j) = (self._index(scope[0]), self._index(scope[1]))
+            self.__not_equal[i].append(j)
+            self.__not_equal[j].append(i)
+        else:
+            for var in scope:
+                self.__other_constraints[self._index(var)].append(constraint)
 
     def get_constraints(self, var=None):
         """Return all constraints, or the constraints for a given variable"""
@@ -106,18 +134,112 @@ class CSP:
         return None
 
     def copy_domains(self):
-        """Returns a copy which contains a copy of the domains list. In all
-        other aspects, this is a flat (shallow) copy of this object.
+        """Returns a copy which contains a copy of the domains list and an
+        empty trail. In all other aspects, this is a flat (shallow) copy of
+        this object. Solvers restore domains from the trail instead.
         """
         result = CSP()
         result.__variables = self.__variables
-        for d in self.__domains:
-            result.__domains.append(d)
+        result.__domains = list(self.__domains)
         result.__constraints = self.__constraints
         result.__var_index_map = self.__var_index_map
         result.__constraint_network = self.__constraint_network
+        result.__values = self.__values
+        result.__value_index_map = self.__value_index_map
+        result.__not_equal = self.__not_equal
+        result.__other_constraints = self.__other_constraints
+        result.__empty = set(self.__empty)
         return result
 
+    # Index based access, for solvers
+
+    def _intern_value(self, value):
+        if value not in self.__value_index_map:
+            self.__value_index_map[value] = len(self.__values)
+            self.__values.append(value)
+        return self.__value_index_map[value]
+
+    def get_index(self, var):
+        """Returns the index of a variable"""
+        return self.__var_index_map[var]
+
+    def get_variable(self, index):
+        """Returns the variable with the given index"""
+        return self.__variables[index]
+
+    def get_value(self, value_index):
+        """Returns the value with the given index"""
+        return self.__values[value_index]
+
+    def get_value_index(self, value):
+        """Returns the index of a value, or None if no domain has held it"""
+        return self.__value_index_map.get(value)
+
+    def get_domain_bits(self, index):
+        """Returns the domain of the variable with the given index as a bitset
+        of value indexes"""
+        return self.__domains[index]
+
+    def set_domain_bits(self, index, bits):
+        self.__domains[index] = bits
+        if bits:
+            self.__empty.discard(index)
+        else:
+            self.__empty.add(index)
+
+    def reduce_domain_bits(self, index, bits):
+        """Keeps only the values in bits in the domain of the variable with the
+        given index, recording the old domain on the trail if it changes.
+        Returns the new domain."""
+        old = self.__domains[index]
+        new = old & bits
+        if new != old:
+            self.__trail.append((index, old))
+            self.set_domain_bits(index, new)
+        return new
+
+    def remove_value_index(self, index, value_index):
+        self.reduce_domain_bits(index, ~(1 << value_index))
+
+    def get_trail_mark(self):
+        """Returns a mark for the current domains, to pass to restore_domains"""
+        return len(self.__trail)
+
+    def restore_domains(self, mark):
+        """Undoes the domain reductions recorded since mark was taken, newest
+        first"""
+        trail = self.__trail
+        while len(trail) > mark:
+            (index, bits) = trail.pop()
+            self.set_domain_bits(index, bits)
+
+    def get_empty_domains(self):
+        """Returns the set of indexes of variables whose domains are empty"""
+        return self.__empty
+
+    def get_not_equal(self, index):
+        """Returns the indexes of the variables that a NotEqualConstraint
+        keeps from taking the same value as the given one, once per constraint"""
+        return self.__not_equal[index]
+
+    def get_other_constraints(self, index):
+        """Returns the constraints on the given variable that are not
+        NotEqualConstraints"""
+        return self.__other_constraints[index]
+
+
+def bit_count(bits):
+    """Returns the number of set bits of an int."""
+    return bin(bits).count("1")
+
+
+def iter_bits(bits):
+    """Yields the indexes of the set bits of an int, lowest first."""
+    while bits:
+        low = bits & -bits
+        yield low.bit_length() - 1
+        bits ^= low
+
 #################################################################
 
 class AustraliaCSP(CSP):
@@ -189,13 +311,58 @@ class BacktrackingSearch(SolutionStrategy):
     # Initializes with no inference or ordering stuff enabled by default
     def __init__(self):
         super().__init__()
-        #assignment = Assignment()
-        #self.csp = csp
+        # While backtrack runs, the assignment and CSP it is working on, and
+        # index arrays kept in step with the assignment for the ordering
+        # functions: the value index of each variable (-1 if unassigned), and
+        # the same in the order mrv considers the variables. Every variable
+        # before _next, or before _next_by_degree in mrv's order, is assigned,
+        # so finding the first unassigned one only looks from there on.
+        self._assignment = None
+        self._csp = None
+        self._current = None
+        self._degree_order = None
+        self._by_degree = None
+        self._position = None
+        self._next = 0
+        self._next_by_degree = 0
+
+    def _track(self, assignment, csp):
+        n = len(csp.get_variables())
+        self._assignment = assignment
+        self._csp = csp
+        self._current = [-1] * n
+        for var in assignment.get_variables():
+            value_index = csp.get_value_index(assignment[var])
+            self._current[csp.get_index(var)] = -2 if value_index is None else value_index
+        degree = [len(csp.get_constraints(var)) for var in csp.get_variables()]
+        self._degree_order = sorted(range(n), key=lambda i: (-degree[i], -i))
+        self._by_degree = [self._current[i] for i in self._degree_order]
+        self._position = [0] * n  # Variable index to its place in _by_degree
+        for p, i in enumerate(self._degree_order):
+            self._position[i] = p
+        self._next = self._next_by_degree = 0
+
+    def _set(self, i, value_index):
+        self._current[i] = self._by_degree[self._position[i]] = value_index
+        if value_index == -1:
+            self._next = min(self._next, i)
+            self._next_by_degree = min(self._next_by_degree, self._position[i])
+
+    def _untrack(self):
+        self._assignment = self._csp = None
+        self._current = self._degree_order = self._by_degree = self._position = None
 
     # Default order of variables
     def first_unassigned(self, assignment, csp):
-        var_list = [var for var in csp.get_variables() if not assignment.__contains__(var)]
-        return var_list[0]
+        if self._assignment is not assignment or self._csp is not csp:
+            var_list = [var for var in csp.get_variables() if not assignment.__contains__(var)]
+            return var_list[0]
+        current = self._current
+        i = self._next
+        while current[i] != -1:
+            i += 1
+        self._next = i
+        return csp.get_variable(i)
 
     # Default order of domains
     def unordered(self, var, assignment, csp):
@@ -205,53 +372,98 @@ class BacktrackingSearch(SolutionStrategy):
     def no_inference(self, csp, var, values):
         return True
 
+    # An unassigned variable with an empty domain if there is one, or else
+    # the unassigned variable in the most constraints (the last, on ties)
     def mrv(self, assignment, csp):
-        result = None
-        count = 0
-        for var in csp.get_variables():
-            if not assignment.__contains__(var):
-                if len(csp.get_domain(var)) == 0:
-                    return var
-                num_conflicts = len(csp.get_constraints(var))
-                if num_conflicts >= count:
-                    count = num_conflicts
-                    result = var
+        if self._assignment is not assignment or self._csp is not csp:
+            result = None
+            count = 0
+            for var in csp.get_variables():
+                if not assignment.__contains__(var):
+                    if len(csp.get_domain(var)) == 0:
+                        return var
+                    num_conflicts = len(csp.get_constraints(var))
+                    if num_conflicts >= count:
+                        count = num_conflicts
+                        result = var
+            return result
+
+        current = self._current
+        empty = [i for i in csp.get_empty_domains() if current[i] == -1]
+        if empty:
+            return csp.get_variable(min(empty))
+        by_degree = self._by_degree
+        p = self._next_by_degree
+        while by_degree[p] != -1:
+            p += 1
+        self._next_by_degree = p
+        return csp.get_variable(self._degree_order[p])
+
+    # Indexes of the variables sharing a binary constraint with variable i
+    def neighbors(self, csp, i):
+        result = set(csp.get_not_equal(i))
+        var = csp.get_variable(i)
+        for con in csp.get_other_constraints(i):
+            other = csp.get_neighbor(var, con)
+            if other is not None:
+                result.add(csp.get_index(other))
         return result
 
+    # Maintains arc consistency once var has been given value, whose domain is
+    # then just value: arcs into var are revised first, then arcs into each
+    # variable that loses values. With no var, every arc is revised. Values
+    # are removed through the CSP's trail, so backtracking puts them back.
     def AC3(self, csp, var, value):
-        queue = collections.deque()
-        for Xi in csp.get_variables():
-            cons = csp.get_constraints(Xi)
-            for con in cons:
-                Xj = csp.get_neighbor(Xi, con)
-                queue.append((Xi, Xj))
+        if var is None:
+            queue = collections.deque((i, j) for i in range(len(csp.get_variables()))
+                                      for j in self.neighbors(csp, i))
+        else:
+            j = csp.get_index(var)
+            queue = collections.deque((k, j) for k in self.neighbors(csp, j))
 
         while len(queue) != 0:
-            (Xi, Xj) = queue.popleft()
-            if self.revise(csp, Xi, Xj):
-                if csp.get_domain(Xi).__len__() == 0:
+            (i, j) = queue.popleft()
+            if self.revise(csp, i, j):
+                if csp.get_domain_bits(i) == 0:
                     return False
-                cons = csp.get_constraints(Xi)
-                for con in cons:
-                    Xk = csp.get_neighbor(Xi, con)
-                    if Xk != Xi:
-                        queue.append((Xk, Xi))
+                for k in self.neighbors(csp, i):
+                    if k != j:
+                        queue.append((k, i))
         return True
 
-
-    def revise(self, csp, Xi, Xj):
-        revised = False
-        Di = csp.get_domain(Xi)
-        Dj = csp.get_domain(Xj)
-        assignment = Assignment()
-        cons = csp.get_constraints(Xi)
-        for x in Di:
-            for y in Dj:
-                assignment.__setitem__(Xi, y)
-                if not assignment.is_consistent(cons):
-                    csp.remove_value_from_domain(Xi, x)
-                    revised = True
-        return revised
+    # Removes the values of variable i that no value of variable j supports,
+    # and returns True if there were any. For a NotEqualConstraint only a
+    # single remaining value of j rules anything out.
+    def revise(self, csp, i, j):
+        Di = csp.get_domain_bits(i)
+        Dj = csp.get_domain_bits(j)
+        differ = j in csp.get_not_equal(i)
+        Xi = csp.get_variable(i)
+        Xj = csp.get_variable(j)
+        cons = [con for con in csp.get_other_constraints(i)
+                if csp.get_neighbor(Xi, con) == Xj]
+
+        keep = Di
+        if not cons:
+            if differ and Dj & (Dj - 1) == 0:
+                keep &= ~Dj
+        else:
+            assignment = Assignment()
+            for x in iter_bits(Di):
+                assignment.__setitem__(Xi, csp.get_value(x))
+                for y in iter_bits(Dj):
+                    if differ and x == y:
+                        continue
+                    assignment.__setitem__(Xj, csp.get_value(y))
+                    if assignment.is_consistent(cons):
+                        break
+                else:
+                    keep &= ~(1 << x)
+
+        if keep == Di:
+            return False
+        csp.reduce_domain_bits(i, keep)
+        return True
 
 
 
@@ -259,6 +471,15 @@ class BacktrackingSearch(SolutionStrategy):
             select_unassigned_variable=None, 
             order_domain_values=None, 
             inference=None):
+        """Searches depth first for a complete, consistent extension of
+        assignment. Variables and values are tracked by index, so checking a
+        NotEqualConstraint is an int comparison, and the search keeps its own
+        stack instead of recursing once per variable.
+
+        An assigned variable's domain is narrowed to its value, and together
+        with whatever inference removes this is undone from the CSP's trail
+        when the value fails. The domains are left as they were found.
+        """
 
         if select_unassigned_variable == None:
             select_unassigned_variable = self.first_unassigned
@@ -269,57 +490,182 @@ class BacktrackingSearch(SolutionStrategy):
         if inference == None:
             inference = self.no_inference
 
-        def solve(self, assignment):
+        self._track(assignment, csp)
+        current = self._current
+        unassigned = current.count(-1)
+        start = csp.get_trail_mark()
 
-            if assignment.is_complete(csp.get_variables()):
+        try:
+            if unassigned == 0:
                 return assignment
 
             var = select_unassigned_variable(assignment, csp)
-
-            for value in order_domain_values(var, assignment, csp):
-
-                assignment.__setitem__(var, value)
-                if assignment.is_consistent(csp.get_constraints(var)):
-
-                    inf = inference(csp, var, value)
-                    #inference = True # Temporary
-                    #inf = self.AC3(csp)
-                    #print(inf)
-
-                    if inf:
-                        result = solve(self, assignment)
-                        if result is not None:
-                            return result
-
-                assignment.__delitem__(var)
-                csp.remove_value_from_domain(var, value)
+            # Each entry is a variable, the values still to try for it, and
+            # the trail mark to restore the domains to when a value fails
+            stack = [(var, iter(order_domain_values(var, assignment, csp)), csp.get_trail_mark())]
+
+            while stack:
+                (var, values, mark) = stack[-1]
+                i = csp.get_index(var)
+                if current[i] != -1:
+                    # Everything below the value assigned to var failed
+                    self._set(i, -1)
+                    unassigned += 1
+                    assignment.__delitem__(var)
+                    csp.restore_domains(mark)
+
+                for value in values:
+                    value_index = csp.get_value_index(value)
+                    self._set(i, value_index)
+                    unassigned -= 1
+                    assignment.__setitem__(var, value)
+
+                    consistent = value_index not in map(current.__getitem__, csp.get_not_equal(i)) \
+                        and assignment.is_consistent(csp.get_other_constraints(i))
+                    if consistent:
+                        csp.reduce_domain_bits(i, 1 << value_index)
+                    if consistent and inference(csp, var, value):
+                        if unassigned == 0:
+                            return assignment
+                        var = select_unassigned_variable(assignment, csp)
+                        stack.append((var, iter(order_domain_values(var, assignment, csp)),
+                                      csp.get_trail_mark()))
+                        break
+
+                    self._set(i, -1)
+                    unassigned += 1
+                    assignment.__delitem__(var)
+                    csp.restore_domains(mark)
+                else:
+                    stack.pop()
 
             return None
-
-        result = solve(self, assignment)
-        return result
+        finally:
+            csp.restore_domains(start)
+            self._untrack()
 
 
 #################################################################
 
 class MinConflictsSearch(SolutionStrategy):
+    """Starts from a random complete assignment and repeatedly gives a random
+    conflicted variable the value with the fewest conflicts. Values are kept
+    by index, and the number of violated constraints of every variable and
+    the list of conflicted variables are updated as values change, so a step
+    costs time in proportion to the variable's constraints, not the CSP's.
+    """
     def __init__(self):
         super().__init__()
 
     def solve(self, csp, max_steps=10000):
-        current = self.random_assignment(csp)
+        n = len(csp.get_variables())
+        current = self.random_values(csp)
+        assignment = Assignment()  # Mirrors current, for constraints other than NotEqual
+        for i in range(n):
+            assignment.__setitem__(csp.get_variable(i), csp.get_value(current[i]))
+
+        conflicts = [self.count_conflicts(i, current, assignment, csp) for i in range(n)]
+        conflicted = [i for i in range(n) if conflicts[i]]
+        position = [-1] * n  # Place of each variable in conflicted, or -1
+        for p, i in enumerate(conflicted):
+            position[i] = p
+
+        def update(i):
+            if conflicts[i] and position[i] == -1:
+                position[i] = len(conflicted)
+                conflicted.append(i)
+            elif not conflicts[i] and position[i] != -1:
+                last = conflicted.pop()
+                if last != i:
+                    conflicted[position[i]] = last
+                    position[last] = position[i]
+                position[i] = -1
+
+        for step in range(max_steps):
+            if not conflicted:
+                return assignment
+            i = random.choice(conflicted)
+            var = csp.get_variable(i)
+            old = current[i]
+            new = self.get_min_conflict_value(i, current, assignment, csp)
+            if new == old:
+                continue
+
+            others = csp.get_other_constraints(i)
+            before = [not con.is_satisfied_with(assignment) for con in others]
+            current[i] = new
+            assignment.__setitem__(var, csp.get_value(new))
+            for j in csp.get_not_equal(i):
+                if current[j] == old:
+                    conflicts[i] -= 1
+                    conflicts[j] -= 1
+                elif current[j] == new:
+                    conflicts[i] += 1
+                    conflicts[j] += 1
+                update(j)
+            for con, was_violated in zip(others, before):
+                change = int(not con.is_satisfied_with(assignment)) - int(was_violated)
+                if change:
+                    for other in con.get_scope():
+                        conflicts[csp.get_index(other)] += change
+                        update(csp.get_index(other))
+            update(i)
+
+        if not conflicted:
+            return assignment
+        return None
 
-        for i in range (max_steps):
-            if current.is_solution(csp):
-                return current
-            conflicted_vars = self.get_conflicted_vars(current, csp)
-            var = random.choice(conflicted_vars)
-            value = self.get_min_conflict_domain(var, current, csp)
-            current.__setitem__(var, value)
+    def random_values(self, csp):
+        """Returns a random value index from each variable's domain."""
+        result = []
+        for i in range(len(csp.get_variables())):
+            result.append(random.choice(list(iter_bits(csp.get_domain_bits(i)))))
+        return result
 
-        return None
+    def count_conflicts(self, i, current, assignment, csp):
+        """Number of constraints on variable i that current violates."""
+        value_index = current[i]
+        num_conflicts = 0
+        for j in csp.get_not_equal(i):
+            if current[j] == value_index:
+                num_conflicts += 1
+        for con in csp.get_other_constraints(i):
+            if not con.is_satisfied_with(assignment):
+                num_conflicts += 1
+        return num_conflicts
+
+    def get_min_conflict_value(self, i, current, assignment, csp):
+        """A value index for variable i with the fewest conflicts given the
+        other variables' values, chosen at random among ties."""
+        counts = collections.Counter(current[j] for j in csp.get_not_equal(i))
+        others = csp.get_other_constraints(i)
+        var = csp.get_variable(i)
+        old = assignment[var]
+        min_conflicts = None
+        result_list = []
+
+        for value_index in iter_bits(csp.get_domain_bits(i)):
+            num_conflicts = counts[value_index]
+            if others:
+                assignment.__setitem__(var, csp.get_value(value_index))
+                for con in others:
+                    if not con.is_satisfied_with(assignment):
+                        num_conflicts += 1
+            if min_conflicts is None or num_conflicts < min_conflicts:
+                result_list = []
+                min_conflicts = num_conflicts
+            if num_conflicts == min_conflicts:
+                result_list.append(value_index)
+
+        if others:
+            assignment.__setitem__(var, old)
+        return random.choice(result_list)
+
+    # The methods below work on whole Assignments, as this class did before
+    # it kept values by index. solve no longer uses them.
 
     def num_conflicts(self, assignment, constraints):
+        """Number of the given constraints that assignment violates."""
         num_conflicts = 0
         for con in constraints:
             if not con.is_satisfied_with(assignment):
@@ -327,13 +673,15 @@ class MinConflictsSearch(SolutionStrategy):
         return num_conflicts
 
     def random_assignment(self, csp):
+        """Returns an Assignment of a random value to every variable."""
         assignment = Assignment()
-        for var in csp.get_variables():
-            val = random.choice(csp.get_domain(var))
-            assignment.__setitem__(var, val)
+        for i, value_index in enumerate(self.random_values(csp)):
+            assignment.__setitem__(csp.get_variable(i), csp.get_value(value_index))
         return assignment
 
     def get_conflicted_vars(self, assignment, csp):
+        """The variables in the scope of each constraint that assignment
+        violates, once per constraint."""
         result = []
         for con in csp.get_constraints():
             if not con.is_satisfied_with(assignment):
@@ -342,21 +690,15 @@ class MinConflictsSearch(SolutionStrategy):
         return result
 
     def get_min_conflict_domain(self, var, assignment, csp):
-        min_conflicts = 9999999
-        cons = csp.get_constraints()
-        assignment_copy = assignment.copy()
-        result_list = []
-
-        for value in csp.get_domain(var):
-            assignment_copy.__setitem__(var, value)
-            num_conflicts = self.num_conflicts(assignment, cons)
-            if num_conflicts <= min_conflicts:
-                if num_conflicts < min_conflicts:
-                    result_list = []
-                    min_conflicts = num_conflicts
-            result_list.append(value)
-
-        return random.choice(result_list)
+        """A value for var with the fewest conflicts given the other
+        variables' values in assignment, chosen at random among ties."""
+        current = [-1] * len(csp.get_variables())
+        for other in assignment.get_variables():
+            value_index = csp.get_value_index(assignment[other])
+            if value_index is not None:
+                current[csp.get_index(other)] = value_index
+        value_index = self.get_min_conflict_value(csp.get_index(var), current, assignment.copy(), csp)
+        return csp.get_value(value_index)
 
 
 #################################################################
@@ -367,43 +709,61 @@ class Domain:
     implementation guarantees that domains are never changed after they have been
     created. Domain reduction is implemented by replacement instead of modification,
     so previous states can easily and safely be restored.
+
+    The values are stored as a bitset over a list of distinct values, which
+    domains derived from one another share, so a domain costs one int and
+    size, membership and removal take constant time.
     """
     def __init__(self, values=None):
         if values is None:
             values = []
         self.__values = []
+        self.__index = {}
         for v in values:
-            self.__values.append(v)
+            if v not in self.__index:
+                self.__index[v] = len(self.__values)
+                self.__values.append(v)
+        self.__bits = (1 << len(self.__values)) - 1
+
+    @classmethod
+    def from_bits(cls, values, index, bits):
+        """Returns the domain holding values[i] for each bit i set in bits,
+        where index maps each value back to its position in values.
+        """
+        domain = cls.__new__(cls)
+        domain.__values = values
+        domain.__index = index
+        domain.__bits = bits
+        return domain
 
     def is_empty(self):
-        return len(self.__values) == 0
+        return self.__bits == 0
 
     def get_values(self):
-        result = []
-        for v in self.__values:
-            result.append(v)
-        return result
+        return list(self)
 
     def __len__(self):
-        return len(self.__values)
+        return bit_count(self.__bits)
 
     def __getitem__(self, key):
-        return self.__values[key]
+        return self.get_values()[key]
 
     def __contains__(self, item):
-        return item in self.__values
+        i = self.__index.get(item)
+        return i is not None and (self.__bits >> i) & 1 == 1
 
     def __iter__(self):
-        for item in self.__values:
-            yield item
+        values = self.__values
+        for i in iter_bits(self.__bits):
+            yield values[i]
 
     def __eq__(self, other):
-        return self.__values == other.__values
+        return self.get_values() == other.get_values()
 
     def __str__(self):
         result = ['{']
         comma = False
-        for value in self.__values:
+        for value in self:
             if comma:
                 result.append(',')
             result.append(str(value))
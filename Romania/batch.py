@@ -0,0 +1,133 @@
+"""Batch solver for sliding tile puzzles
+
+Reads one start state per line, as a list like [1,4,2,3,0,5,6,7,8], solves
+them across a pool of worker processes and writes one JSON line per instance
+as results come in:
+	{"index": 0, "tiles": [...], "algorithm": "astar", "solved": true,
+	 "cost": 2, "nodes": 3, "time": 0.0001, "peak_frontier": 5, "path": [...]}
+Instances that cannot reach the goal are not searched, and are written with
+"solved": false and "error": "Unsolvable". Once every instance is done, a
+summary of the throughput is printed."""
+
+import sys
+import ast
+import json
+import time
+import contextlib
+import concurrent.futures
+import search
+import puzzle
+
+ALGORITHMS = {
+	"bfs": search.breadth_first_search,
+	"dfs": search.depth_first_search,
+	"astar": search.astar_search,
+	"idastar": search.iterative_deepening_astar,
+}
+
+#______________________________________________________________________________
+
+def read_states(filename):
+	"Yields the start states in a file, skipping blank lines and # comments."
+	with open(filename) as file:
+		for line in file:
+			line = line.strip()
+			if line and not line.startswith("#"):
+				yield ast.literal_eval(line)
+
+def solve(job):
+	"""Solves one instance. job is (index, tiles, algorithm, heuristic);
+	the goal is the tiles in order with the blank first. Instances that
+	cannot reach the goal are reported without searching, since most of the
+	searches would run until the whole half of the state space they are in
+	was exhausted, and IDA* would never stop."""
+	(index, tiles, algorithm, heuristic) = job
+	width = int(round(len(tiles) ** 0.5))
+	goal = list(range(len(tiles)))
+	if not puzzle.solvable(tiles, goal, width):
+		return {"index": index, "tiles": tiles, "algorithm": algorithm,
+				"solved": False, "time": 0.0, "peak_frontier": None,
+				"error": "Unsolvable"}
+	problem = puzzle.SlidingPuzzle(tiles, goal, width, heuristic)
+	stats = {}
+
+	start_time = time.perf_counter()
+	# The searches print "Not Found", which must not end up among the records
+	with contextlib.redirect_stdout(sys.stderr):
+		if algorithm == "idastar":
+			result = ALGORITHMS[algorithm](problem)
+			if result is not None:
+				stats["max_frontier"] = result[3]["peak_nodes"]
+		else:
+			result = ALGORITHMS[algorithm](problem, stats)
+	elapsed = time.perf_counter() - start_time
+
+	record = {"index": index, "tiles": tiles, "algorithm": algorithm,
+			  "solved": result is not None, "time": elapsed,
+			  "peak_frontier": stats.get("max_frontier")}
+	if result is not None:
+		record["cost"] = result[2]
+		record["nodes"] = result[1]
+		record["path"] = [x.action for x in result[0].path()[::-1]][1:]
+	return record
+
+def solve_batch(states, algorithm="astar", heuristic="manhattan", processes=None, output=None):
+	"""Solves every state in states on a process pool. Each result is
+	written to output as a JSON line as soon as it is available, in input
+	order. Returns the summary."""
+	if algorithm not in ALGORITHMS:
+		raise ValueError(algorithm + " is not a valid algorithm")
+	jobs = ((i, tiles, algorithm, heuristic) for i, tiles in enumerate(states))
+	summary = {"instances": 0, "solved": 0, "nodes": 0, "search_time": 0.0}
+
+	start_time = time.perf_counter()
+	with concurrent.futures.ProcessPoolExecutor(max_workers=processes) as pool:
+		for record in pool.map(solve, jobs, chunksize=8):
+			summary["instances"] += 1
+			summary["search_time"] += record["time"]
+			if record["solved"]:
+				summary["solved"] += 1
+				summary["nodes"] += record["nodes"]
+			if output is not None:
+				output.write(json.dumps(record) + "\n")
+				output.flush()
+	summary["wall_time"] = time.perf_counter() - start_time
+
+	wall_time = summary["wall_time"] or 1e-9
+	summary["instances_per_second"] = summary["instances"] / wall_time
+	summary["nodes_per_second"] = summary["nodes"] / wall_time
+	return summary
+
+#______________________________________________________________________________
+## Main
+
+''' Usage:
+	python batch.py <states file> <bfs|dfs|astar|idastar> <output jsonl> [processes] [heuristic]
+An output of - writes the results to stdout.'''
+
+def argParse(args):
+	processes = int(args[4]) if len(args) > 4 else None
+	heuristic = args[5] if len(args) > 5 else "manhattan"
+	if args[2] not in ALGORITHMS:
+		print("Invalid Argument: "+args[2]+" is not a valid algorithm")
+		return
+
+	if args[3] == "-":
+		summary = solve_batch(read_states(args[1]), args[2], heuristic, processes, sys.stdout)
+		print(json.dumps(summary), file=sys.stderr)
+	else:
+		with open(args[3], 'w') as output:
+			summary = solve_batch(read_states(args[1]), args[2], heuristic, processes, output)
+		print("Instances:", summary["instances"])
+		print("Solved:", summary["solved"])
+		print("Nodes Visited:", summary["nodes"])
+		print("Wall Time: %.2fs" % summary["wall_time"])
+		print("Instances/s: %.1f" % summary["instances_per_second"])
+		print("Nodes/s: %.0f" % summary["nodes_per_second"])
+
+
+def main():
+	argParse(sys.argv)
+
+if __name__ == '__main__':
+	main()
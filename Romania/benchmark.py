@@ -0,0 +1,300 @@
+"""Benchmarks for the search algorithms
+
+Three suites of fixed, seeded cases:
+	romania		every city to Bucharest
+	eight		8-puzzle scrambles at increasing depth
+	graphs		grid and random geometric graphs of 10^3 to 10^6 states
+Every algorithm that suits a suite is run on each of its cases, and one JSON
+line is written per run:
+	{"suite": "romania", "case": "Arad", "algorithm": "astar", "solved": true,
+	 "cost": 418, "nodes_visited": 6, "max_frontier": 6, "time": 0.0001,
+	 "peak_memory": 5120}
+time is the best of the repeats, and peak_memory is the most bytes the
+search had allocated at once, from a separate run under tracemalloc so it
+does not slow down the timed ones. Two output files can be compared to find
+regressions."""
+
+import sys
+import math
+import json
+import time
+import array
+import random
+import contextlib
+import tracemalloc
+import search
+import puzzle
+import csrgraph
+
+ALGORITHMS = {
+	"bfs": search.breadth_first_search,
+	"dfs": search.depth_first_search,
+	"ucs": search.uniform_cost_search,
+	"astar": search.astar_search,
+	"greedy": search.greedy_best_first_search,
+	"idastar": search.iterative_deepening_astar,
+	"rbfs": search.recursive_best_first_search,
+	"smastar": search.sma_star_search,
+	"arastar": search.ara_star_search,
+	"biucs": search.bidirectional_ucs,
+	"biastar": search.bidirectional_astar,
+	"beam": search.beam_search,
+}
+
+SUITE_ALGORITHMS = {
+	"romania": list(ALGORITHMS),
+	"eight": ["bfs", "ucs", "astar", "greedy", "idastar", "rbfs", "smastar", "arastar", "beam"],
+	"graphs": ["bfs", "ucs", "astar", "greedy", "beam"],
+}
+
+EIGHT_DEPTHS = [4, 8, 12, 16, 20, 24, 28]
+GRAPH_SIZES = [10 ** 3, 10 ** 4, 10 ** 5, 10 ** 6]
+
+#______________________________________________________________________________
+# Cases, as (case name, problem) pairs
+
+def romania_cases():
+	cities = sorted(search.RomaniaProblem(None, None).map.edges)
+	return [(city, search.RomaniaProblem(city, "Bucharest")) for city in cities]
+
+def eight_cases(seed=0):
+	"""One position at each optimal depth in EIGHT_DEPTHS, picked from a
+	breadth-first enumeration out from the goal."""
+	rand = random.Random(seed)
+	goal = list(range(9))
+	problem = puzzle.SlidingPuzzle(goal, goal)
+	layers = [[problem.initial]]
+	seen = {problem.initial}
+	while len(layers) <= max(EIGHT_DEPTHS):
+		layer = []
+		for state in layers[-1]:
+			for (action, next) in problem.successor(state):
+				if next not in seen:
+					seen.add(next)
+					layer.append(next)
+		layers.append(layer)
+
+	cases = []
+	for depth in EIGHT_DEPTHS:
+		tiles = puzzle.unpack(rand.choice(sorted(layers[depth])))
+		cases.append(("depth %d %s" % (depth, tiles), puzzle.SlidingPuzzle(tiles, goal)))
+	return cases
+
+def grid_graph(side, seed=0):
+	"""A side by side grid with 4-neighbour edges of random cost 1 to 9, and
+	the Manhattan distance to the far corner as the heuristic."""
+	rand = random.Random(seed)
+	n = side * side
+	# The costs of the edges to the right of and below each state
+	right = array.array('l', (rand.randint(1, 9) for i in range(n)))
+	down = array.array('l', (rand.randint(1, 9) for i in range(n)))
+	offsets = array.array('l', [0])
+	targets = array.array('l')
+	weights = array.array('l')
+	for state in range(n):
+		row, col = divmod(state, side)
+		if row > 0:
+			targets.append(state - side)
+			weights.append(down[state - side])
+		if row < side - 1:
+			targets.append(state + side)
+			weights.append(down[state])
+		if col > 0:
+			targets.append(state - 1)
+			weights.append(right[state - 1])
+		if col < side - 1:
+			targets.append(state + 1)
+			weights.append(right[state])
+		offsets.append(len(targets))
+	graph = csrgraph.CSRGraph(range(n), offsets, targets, weights)
+	problem = csrgraph.CSRProblem(graph, 0, n - 1)
+	problem.heuristic = array.array('d', (2 * (side - 1) - sum(divmod(state, side))
+										  for state in range(n)))
+	return problem
+
+def geometric_graph(n, seed=0):
+	"""n random points in a square of area n, each joined to its three nearest
+	neighbours by an edge costing its length times 10 rounded up, with the
+	straight line distance times 10 as the heuristic. Goes between the points
+	nearest to opposite corners, which may not be connected."""
+	rand = random.Random(seed)
+	side = int(math.ceil(math.sqrt(n)))
+	points = [(rand.random() * side, rand.random() * side) for i in range(n)]
+	cells = {}
+	for i, (x, y) in enumerate(points):
+		cells.setdefault((int(x), int(y)), []).append(i)
+
+	adjacent = [dict() for i in range(n)]
+	for i, (x, y) in enumerate(points):
+		cx, cy = int(x), int(y)
+		radius = 1
+		while True:
+			near = [j for dx in range(-radius, radius + 1) for dy in range(-radius, radius + 1)
+					for j in cells.get((cx + dx, cy + dy), ()) if j != i]
+			if len(near) >= 3 or radius > side:
+				break
+			radius += 1
+		near.sort(key=lambda j: (points[j][0] - x) ** 2 + (points[j][1] - y) ** 2)
+		for j in near[:3]:
+			cost = int(math.ceil(10 * math.dist(points[i], points[j])))
+			adjacent[i][j] = cost
+			adjacent[j][i] = cost
+
+	offsets = array.array('l', [0])
+	targets = array.array('l')
+	weights = array.array('l')
+	for i in range(n):
+		for (j, cost) in adjacent[i].items():
+			targets.append(j)
+			weights.append(cost)
+		offsets.append(len(targets))
+	graph = csrgraph.CSRGraph(range(n), offsets, targets, weights)
+
+	start = min(range(n), key=lambda i: points[i][0] + points[i][1])
+	goal = max(range(n), key=lambda i: points[i][0] + points[i][1])
+	problem = csrgraph.CSRProblem(graph, start, goal)
+	gx, gy = points[goal]
+	problem.heuristic = array.array('d', (10 * math.hypot(x - gx, y - gy) for (x, y) in points))
+	return problem
+
+def graph_cases(max_nodes=10 ** 6, seed=0):
+	"Yields the cases one at a time, so only one large graph is built at once."
+	for n in GRAPH_SIZES:
+		if n > max_nodes:
+			break
+		yield ("grid %d" % n, grid_graph(int(round(math.sqrt(n))), seed))
+		yield ("geometric %d" % n, geometric_graph(n, seed))
+
+#______________________________________________________________________________
+
+def measure(algorithm, problem, repeat=1, memory=True):
+	"""Runs one algorithm on one problem and returns its record, without the
+	suite and case."""
+	function = ALGORITHMS[algorithm]
+	record = {"algorithm": algorithm, "time": float("inf")}
+	for i in range(repeat):
+		stats = {}
+		start_time = time.perf_counter()
+		# Keeps "Not Found" out of the records when they go to stdout
+		with contextlib.redirect_stdout(sys.stderr):
+			result = function(problem, stats=stats)
+		record["time"] = min(record["time"], time.perf_counter() - start_time)
+
+	record["solved"] = result is not None
+	record["cost"] = result[2] if result is not None else None
+	record["nodes_visited"] = result[1] if result is not None else None
+	record["max_frontier"] = stats.get("max_frontier", stats.get("peak_nodes"))
+
+	if memory:
+		tracemalloc.start()
+		with contextlib.redirect_stdout(sys.stderr):
+			function(problem)
+		record["peak_memory"] = tracemalloc.get_traced_memory()[1]
+		tracemalloc.stop()
+	return record
+
+def run(suites, output, repeat=1, memory=True, max_nodes=10 ** 6):
+	"""Runs the suites and writes their records to output as JSON lines.
+	Returns the records."""
+	records = []
+	for suite in suites:
+		if suite == "romania":
+			cases = romania_cases()
+		elif suite == "eight":
+			cases = eight_cases()
+		elif suite == "graphs":
+			cases = graph_cases(max_nodes)
+		else:
+			raise ValueError(suite + " is not a valid suite")
+		for (case, problem) in cases:
+			for algorithm in SUITE_ALGORITHMS[suite]:
+				record = {"suite": suite, "case": case}
+				record.update(measure(algorithm, problem, repeat, memory))
+				records.append(record)
+				search.write_records([record], output)
+				output.flush()
+	return records
+
+def read_records(filename):
+	with open(filename) as file:
+		return [json.loads(line) for line in file if line.strip()]
+
+def compare(old, new, threshold=0.1):
+	"""Matches two lists of records by suite, case and algorithm. Returns
+	(regressions, totals): the runs whose time or nodes visited grew by more
+	than threshold, or whose cost changed, as (key, field, old, new); and the
+	total time and nodes visited of the matched runs before and after."""
+	old = {(r["suite"], r["case"], r["algorithm"]): r for r in old}
+	regressions = []
+	totals = {"time": [0.0, 0.0], "nodes_visited": [0, 0]}
+	for r in new:
+		key = (r["suite"], r["case"], r["algorithm"])
+		if key not in old:
+			continue
+		before = old[key]
+		if before["cost"] != r["cost"]:
+			regressions.append((key, "cost", before["cost"], r["cost"]))
+		for field in ["time", "nodes_visited"]:
+			if before[field] is None or r[field] is None:
+				continue
+			totals[field][0] += before[field]
+			totals[field][1] += r[field]
+			if r[field] > before[field] * (1 + threshold):
+				regressions.append((key, field, before[field], r[field]))
+	return regressions, totals
+
+#______________________________________________________________________________
+## Main
+
+''' Usage:
+	python benchmark.py run <output jsonl> [romania] [eight] [graphs] [--repeat n] [--max-nodes n] [--no-memory]
+	python benchmark.py compare <old jsonl> <new jsonl> [threshold]
+run runs every suite unless some are named, and an output of - writes to
+stdout. compare lists runs that got more than threshold (default 0.1) slower
+or expanded more nodes, or changed cost.'''
+
+def argParse(args):
+	if args[1] == "run":
+		options = {"repeat": 1, "memory": True, "max_nodes": 10 ** 6}
+		suites = []
+		i = 3
+		while i < len(args):
+			if args[i] == "--repeat":
+				options["repeat"] = int(args[i + 1])
+				i += 1
+			elif args[i] == "--max-nodes":
+				options["max_nodes"] = int(args[i + 1])
+				i += 1
+			elif args[i] == "--no-memory":
+				options["memory"] = False
+			else:
+				suites.append(args[i])
+			i += 1
+		suites = suites or list(SUITE_ALGORITHMS)
+
+		if args[2] == "-":
+			run(suites, sys.stdout, **options)
+		else:
+			with open(args[2], 'w') as output:
+				records = run(suites, output, **options)
+			print("Runs:", len(records))
+			print("Total Time: %.2fs" % sum(r["time"] for r in records))
+
+	elif args[1] == "compare":
+		threshold = float(args[4]) if len(args) > 4 else 0.1
+		regressions, totals = compare(read_records(args[2]), read_records(args[3]), threshold)
+		for (key, field, before, after) in regressions:
+			print(" / ".join(key) + ":", field, before, "->", after)
+		print("Regressions:", len(regressions))
+		print("Total Time: %.2fs -> %.2fs" % tuple(totals["time"]))
+		print("Total Nodes Visited: %d -> %d" % tuple(totals["nodes_visited"]))
+
+	else:
+		print("Invalid Argument: "+args[1]+" is not a valid command")
+
+
+def main():
+	argParse(sys.argv)
+
+if __name__ == '__main__':
+	main()
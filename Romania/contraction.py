@@ -0,0 +1,235 @@
+"""Contraction Hierarchies
+
+States are contracted one at a time, least important first. Contracting a state
+removes it from the graph and adds a shortcut between each pair of its
+neighbours whose shortest path ran through it. Every shortest path then has an
+equivalent path that only climbs in rank from both ends, so a query is a small
+bidirectional Dijkstra over upward edges. Shortcuts remember the state they
+skip, so the paths can be unpacked back into the original edges."""
+
+import sys
+import json
+import time
+import search
+import structs
+
+#______________________________________________________________________________
+
+class ContractionHierarchy:
+
+	def __init__(self, rank, edges):
+		self.rank = rank		# State to its position in the contraction order
+		self.edges = edges		# (state1, state2) to (cost, skipped state or None)
+		self.up = ({}, {})		# Upward edges for the forward and backward searches
+		for state in rank:
+			self.up[0][state] = []
+			self.up[1][state] = []
+		for (state1, state2), (cost, via) in edges.items():
+			if rank[state1] < rank[state2]:
+				self.up[0][state1].append((state2, cost))
+			else:
+				self.up[1][state2].append((state1, cost))
+
+	@classmethod
+	def build(cls, graph, witness_limit=500):
+		"""Contracts every state of graph. witness_limit caps the number of
+		states settled by each witness search; a failed search only costs an
+		unnecessary shortcut, never a wrong answer."""
+		edges = {}
+		out_edges = {}
+		in_edges = {}
+		for state in graph.reverse().edges:
+			out_edges[state] = {}
+			in_edges[state] = {}
+		for state in graph.edges:
+			for (next, cost) in graph.edges[state]:
+				if next != state and cost < out_edges[state].get(next, float("inf")):
+					out_edges[state][next] = cost
+					in_edges[next][state] = cost
+					edges[(state, next)] = (cost, None)
+
+		def shortcuts(state):
+			"Returns the shortcuts needed if state were contracted now."
+			result = []
+			if not out_edges[state]:
+				return result
+			max_out = max(out_edges[state].values())
+			for (prev, in_cost) in in_edges[state].items():
+				witness = cls._witness_search(out_edges, prev, state,
+											  in_cost + max_out, witness_limit)
+				for (next, out_cost) in out_edges[state].items():
+					if next != prev and witness.get(next, float("inf")) > in_cost + out_cost:
+						result.append((prev, next, in_cost + out_cost))
+			return result
+
+		def priority(state):
+			# Edge difference, plus the number of contracted neighbours so
+			# the contraction spreads evenly over the map
+			removed = len(in_edges[state]) + len(out_edges[state])
+			return len(shortcuts(state)) - removed + contracted_neighbors[state]
+
+		contracted_neighbors = {state: 0 for state in out_edges}
+		queue = structs.IndexedPriorityQueue()
+		for state in sorted(out_edges):
+			queue.put(state, state, priority(state))
+
+		rank = {}
+		while not queue.empty():
+			state = queue.get()
+			# Priorities go stale as neighbours are contracted, so recompute
+			# this one lazily and put it back if it is no longer the smallest
+			current = priority(state)
+			if not queue.empty() and current > queue.min_priority():
+				queue.put(state, state, current)
+				continue
+
+			rank[state] = len(rank)
+			for (prev, next, cost) in shortcuts(state):
+				if cost < out_edges[prev].get(next, float("inf")):
+					out_edges[prev][next] = cost
+					in_edges[next][prev] = cost
+					edges[(prev, next)] = (cost, state)
+			for prev in in_edges[state]:
+				del out_edges[prev][state]
+				contracted_neighbors[prev] += 1
+			for next in out_edges[state]:
+				del in_edges[next][state]
+				contracted_neighbors[next] += 1
+			out_edges[state] = {}
+			in_edges[state] = {}
+
+		return cls(rank, edges)
+
+	@staticmethod
+	def _witness_search(out_edges, source, avoid, max_cost, limit):
+		"Dijkstra from source that skips avoid and gives up past max_cost."
+		frontier = structs.IndexedPriorityQueue()
+		frontier.put(source, source, 0)
+		dist = {source: 0}
+		settled = 0
+		while not frontier.empty() and settled < limit:
+			if frontier.min_priority() > max_cost:
+				break
+			state = frontier.get()
+			settled += 1
+			for (next, cost) in out_edges[state].items():
+				if next != avoid and dist[state] + cost < dist.get(next, float("inf")):
+					dist[next] = dist[state] + cost
+					frontier.put(next, next, dist[next])
+		return dist
+
+	def query(self, start, goal):
+		"""Returns (node, nodes_visited, cost) like astar_search, with the
+		node's path unpacked into the original edges."""
+		dist = ({start: 0}, {goal: 0})
+		parent = ({start: None}, {goal: None})
+		frontiers = (structs.IndexedPriorityQueue(), structs.IndexedPriorityQueue())
+		frontiers[0].put(start, start, 0)
+		frontiers[1].put(goal, goal, 0)
+		best_cost = float("inf")
+		meeting = None
+		nodes_visited = 0
+
+		if start == goal:
+			best_cost = 0
+			meeting = start
+
+		# Each side keeps going until it can no longer beat the best path;
+		# the first meeting point is not necessarily on the shortest path
+		while True:
+			active = [d for d in (0, 1) if not frontiers[d].empty()
+					  and frontiers[d].min_priority() < best_cost]
+			if not active:
+				break
+			for d in active:
+				state = frontiers[d].get()
+				nodes_visited += 1
+				if state in dist[1 - d] and dist[d][state] + dist[1 - d][state] < best_cost:
+					best_cost = dist[d][state] + dist[1 - d][state]
+					meeting = state
+				for (next, cost) in self.up[d][state]:
+					g = dist[d][state] + cost
+					if g < dist[d].get(next, float("inf")):
+						dist[d][next] = g
+						parent[d][next] = state
+						frontiers[d].put(next, next, g)
+
+		if meeting is None:
+			print("Not Found")
+			return None
+
+		hops = [meeting]
+		while parent[0][hops[0]] is not None:
+			hops.insert(0, parent[0][hops[0]])
+		while parent[1][hops[-1]] is not None:
+			hops.append(parent[1][hops[-1]])
+
+		# The action is the city driven to, as in RomaniaProblem.transitions
+		node = search.Node(start)
+		for (state1, state2) in zip(hops, hops[1:]):
+			for (prev, next) in self.unpack(state1, state2):
+				node = search.Node(next, node, next, node.path_cost + self.edges[(prev, next)][0])
+		return node, nodes_visited, best_cost
+
+	def unpack(self, state1, state2):
+		"Returns the original edges making up the edge from state1 to state2."
+		result = []
+		stack = [(state1, state2)]
+		while stack:
+			(prev, next) = stack.pop()
+			via = self.edges[(prev, next)][1]
+			if via is None:
+				result.append((prev, next))
+			else:
+				stack.append((via, next))
+				stack.append((prev, via))
+		return result
+
+	def save(self, filename):
+		with open(filename, 'w') as file:
+			order = sorted(self.rank, key=self.rank.get)
+			edges = [[state1, state2, cost, via]
+					 for (state1, state2), (cost, via) in self.edges.items()]
+			json.dump({"order": order, "edges": edges}, file)
+
+	@classmethod
+	def load(cls, filename):
+		with open(filename) as file:
+			data = json.load(file)
+		rank = {state: i for i, state in enumerate(data["order"])}
+		edges = {(state1, state2): (cost, via)
+				 for (state1, state2, cost, via) in data["edges"]}
+		return cls(rank, edges)
+
+#______________________________________________________________________________
+## Main
+
+''' Usage:
+	python contraction.py build <index file>
+	python contraction.py <index file> <origin> <destination>'''
+
+def argParse(args):
+	if args[1] == "build":
+		hierarchy = ContractionHierarchy.build(search.RomaniaProblem(None, None).map)
+		hierarchy.save(args[2])
+		shortcuts = len([1 for (cost, via) in hierarchy.edges.values() if via is not None])
+		print("Shortcuts:", shortcuts)
+
+	else:
+		hierarchy = ContractionHierarchy.load(args[1])
+		start_time = time.perf_counter()
+		result = hierarchy.query(args[2], args[3])
+		elapsed = time.perf_counter() - start_time
+
+		path_list = [x.state for x in result[0].path()[::-1]]
+		print("Final Path: " + " - ".join(path_list))
+		print("Cost:",result[2])
+		print("Nodes Visited:", result[1])
+		print("Query Time: %.1f us" % (elapsed * 1e6))
+
+
+def main():
+	argParse(sys.argv)
+
+if __name__ == '__main__':
+	main()
@@ -0,0 +1,161 @@
+"""Compressed sparse row graphs
+
+States are numbered 0..n-1 and the edges of state i are the entries
+offsets[i] to offsets[i+1] of the flat targets and weights arrays. This takes
+a fraction of the memory of a dict of lists of tuples, and because successors
+pass the edge's position along as the action, path_cost is a single array
+lookup instead of a scan of the neighbour list."""
+
+import sys
+import csv
+import array
+import search
+
+#______________________________________________________________________________
+
+class CSRGraph:
+
+	def __init__(self, names, offsets, targets, weights):
+		self.names = names		# State id to city name
+		self.index = {name: i for i, name in enumerate(names)}
+		self.offsets = offsets
+		self.targets = targets
+		self.weights = weights
+
+	def __len__(self):
+		return len(self.names)
+
+	def num_edges(self):
+		return len(self.targets)
+
+	# Returns (edge, target) pairs for the edges leaving state
+	def neighbors(self, state):
+		targets = self.targets
+		return [(edge, targets[edge]) for edge in range(self.offsets[state], self.offsets[state + 1])]
+
+	@classmethod
+	def from_csv(cls, filename):
+		"""Reads a file in the romania_adjacency_list.csv format: one row per
+		city, followed by pairs of neighbouring city and cost. Rows are read one
+		at a time straight into arrays, so the file is never held in memory."""
+		index = {}
+		names = []
+		row_targets = array.array('l')
+		row_weights = array.array('l')
+		segments = []	# (source id, start, length) of each row in the arrays above
+
+		def state_id(name):
+			if name not in index:
+				index[name] = len(names)
+				names.append(name)
+			return index[name]
+
+		with open(filename, newline='') as file:
+			for row in csv.reader(file):
+				if not row:
+					continue
+				source = state_id(row[0])
+				start = len(row_targets)
+				for i in range(1, len(row), 2):
+					row_targets.append(state_id(row[i]))
+					row_weights.append(int(row[i+1]))
+				segments.append((source, start, len(row_targets) - start))
+
+		# Rows can come in any order, so lay them out again by source id
+		counts = [0] * len(names)
+		for (source, start, length) in segments:
+			counts[source] += length
+		offsets = array.array('l', [0]) * (len(names) + 1)
+		for i in range(len(names)):
+			offsets[i + 1] = offsets[i] + counts[i]
+		fill = array.array('l', offsets[:-1])
+		targets = array.array('l', [0]) * len(row_targets)
+		weights = array.array('l', [0]) * len(row_targets)
+		for (source, start, length) in segments:
+			pos = fill[source]
+			targets[pos:pos + length] = row_targets[start:start + length]
+			weights[pos:pos + length] = row_weights[start:start + length]
+			fill[source] = pos + length
+		return cls(names, offsets, targets, weights)
+
+	@classmethod
+	def from_graph(cls, graph):
+		"Converts a search.Graph."
+		names = sorted(graph.reverse().edges)
+		index = {name: i for i, name in enumerate(names)}
+		offsets = array.array('l', [0])
+		targets = array.array('l')
+		weights = array.array('l')
+		for name in names:
+			for (next, cost) in graph.edges.get(name, ()):
+				targets.append(index[next])
+				weights.append(cost)
+			offsets.append(len(targets))
+		return cls(names, offsets, targets, weights)
+
+#______________________________________________________________________________
+
+class CSRProblem(search.Problem):
+	"""Route finding on a CSRGraph. States are integer ids; initial and goal
+	are given as names. heuristic is an optional dict of city name to an
+	estimate of the distance to goal, as in RomaniaProblem."""
+
+	def __init__(self, graph, initial, goal, heuristic=None):
+		super().__init__(graph.index[initial], graph.index[goal])
+		self.graph = graph
+		self.heuristic = array.array('d', [0]) * len(graph)
+		if heuristic is not None:
+			for name, value in heuristic.items():
+				if name in graph.index:
+					self.heuristic[graph.index[name]] = value
+
+	# The action is the position of the edge, which path_cost uses for the cost
+	def successor(self, state):
+		return self.graph.neighbors(state)
+
+	def transitions(self, state):
+		graph = self.graph
+		targets, weights = graph.targets, graph.weights
+		for edge in range(graph.offsets[state], graph.offsets[state + 1]):
+			yield (edge, targets[edge], weights[edge])
+
+	def path_cost(self, c, state1, action, state2):
+		return c + self.graph.weights[action]
+
+	def h(self, node):
+		return self.heuristic[node.state] + node.path_cost
+
+#______________________________________________________________________________
+## Main
+
+''' Usage:
+	python csrgraph.py <adjacency csv> <bfs|dfs|astar> <origin> <destination>'''
+
+def argParse(args):
+	graph = CSRGraph.from_csv(args[1])
+	heuristic = None
+	if args[4] == "Bucharest":
+		heuristic = search.RomaniaProblem.heuristic
+	problem = CSRProblem(graph, args[3], args[4], heuristic)
+
+	if args[2] == "bfs":
+		result = search.breadth_first_search(problem)
+	elif args[2] == "dfs":
+		result = search.depth_first_search(problem)
+	elif args[2] == "astar":
+		result = search.astar_search(problem)
+	else:
+		print("Invalid Argument: "+args[2]+" is not a valid algorithm")
+		return
+
+	path_list = [graph.names[x.state] for x in result[0].path()[::-1]]
+	print("Final Path: " + " - ".join(path_list))
+	print("Cost:",result[2])
+	print("Nodes Visited:", result[1])
+
+
+def main():
+	argParse(sys.argv)
+
+if __name__ == '__main__':
+	main()
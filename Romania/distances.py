@@ -0,0 +1,88 @@
+"""One-to-all and many-to-many shortest path distances
+
+Instead of an astar_search per pair of cities, each source gets one Dijkstra
+run that reaches every state at once. The sources of a distance matrix are
+split across worker processes, which each receive the graph once when they
+start. Matrices are returned as NumPy arrays when NumPy is installed, and as
+lists of lists otherwise."""
+
+import os
+import sys
+import concurrent.futures
+import search
+
+try:
+	import numpy
+except ImportError:
+	numpy = None
+
+#______________________________________________________________________________
+
+# The graph and targets of the current worker process, set up once per
+# worker by _init_worker so they are not pickled again for every source
+_worker_graph = None
+_worker_targets = None
+
+def _init_worker(edges, targets):
+	global _worker_graph, _worker_targets
+	_worker_graph = search.Graph()
+	_worker_graph.edges = edges
+	_worker_targets = targets
+
+def _distance_row(source):
+	dist = search.dijkstra(_worker_graph, source)
+	return [dist.get(target, float("inf")) for target in _worker_targets]
+
+#______________________________________________________________________________
+
+def distance_matrix(graph, sources=None, targets=None, processes=None):
+	"""Returns a len(sources) by len(targets) matrix of shortest path costs,
+	with infinity for unreachable pairs. sources and targets default to every
+	state in the graph, sorted. processes is the number of worker processes;
+	1 runs every source in this process."""
+	if sources is None:
+		sources = sorted(graph.reverse().edges)
+	if targets is None:
+		targets = sorted(graph.reverse().edges)
+
+	if processes == 1 or len(sources) < 2:
+		_init_worker(graph.edges, targets)
+		rows = [_distance_row(source) for source in sources]
+	else:
+		workers = processes or os.cpu_count() or 1
+		# Chunks keep the per-task overhead small on graphs with many sources
+		chunksize = max(1, len(sources) // (4 * workers))
+		with concurrent.futures.ProcessPoolExecutor(max_workers=workers,
+				initializer=_init_worker, initargs=(graph.edges, targets)) as pool:
+			rows = list(pool.map(_distance_row, sources, chunksize=chunksize))
+
+	if numpy is not None:
+		return numpy.array(rows, dtype=float)
+	return rows
+
+def heuristic_table(graph, goal):
+	"""Returns the exact cost from every state to goal, in the same form as
+	RomaniaProblem.heuristic."""
+	return search.dijkstra(graph.reverse(), goal)
+
+#______________________________________________________________________________
+## Main
+
+''' Usage:
+	python distances.py [processes]		prints the Romania distance matrix as csv'''
+
+def argParse(args):
+	processes = int(args[1]) if len(args) > 1 else None
+	graph = search.RomaniaProblem(None, None).map
+	cities = sorted(graph.edges)
+	matrix = distance_matrix(graph, cities, cities, processes)
+	print("," + ",".join(cities))
+	for city, row in zip(cities, matrix):
+		print(city + "," + ",".join("%g" % cost for cost in row))
+
+
+def main():
+	argParse(sys.argv)
+
+if __name__ == '__main__':
+	main()
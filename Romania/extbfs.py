@@ -0,0 +1,205 @@
+"""External-memory breadth-first enumeration of sliding puzzle state spaces
+
+Each BFS layer is kept on disk as a sorted file of fixed-size records, one
+packed board per record (the blank is the square holding 0, so its position
+does not need to be stored). Only a bounded buffer of states is in memory at
+once. A layer is expanded by streaming the previous one and writing its
+successors out as sorted runs whenever the buffer fills; the runs are then
+merged, and duplicates are dropped during the merge instead of on every
+insert (delayed duplicate detection). In an undirected state space the
+successors of layer d can only lie in layers d-1, d or d+1, so only those two
+older layers are merged against.
+
+Enumerates the 181440 states of the 8-puzzle in seconds, and the 15-puzzle's
+layers for as long as the disk holds out."""
+
+import os
+import sys
+import ast
+import heapq
+import array
+import puzzle
+
+RECORD = 'Q'				# 64 bits is enough for 16 tiles of 4 bits
+CHUNK = 1 << 16				# Records read or written at a time
+MERGE_FAN_IN = 64			# Most runs merged at once, each with a CHUNK buffer
+
+#______________________________________________________________________________
+
+def layer_filename(directory, depth):
+	return os.path.join(directory, "layer.%d" % depth)
+
+def read_records(filename):
+	"Yields the records in a file, reading it a chunk at a time."
+	with open(filename, 'rb') as file:
+		while True:
+			data = file.read(CHUNK * array.array(RECORD).itemsize)
+			if not data:
+				return
+			records = array.array(RECORD)
+			records.frombytes(data)
+			yield from records
+
+def write_records(filename, records):
+	"Writes an iterable of records, buffering a chunk at a time. Returns the count."
+	count = 0
+	buffer = array.array(RECORD)
+	with open(filename, 'wb') as file:
+		for record in records:
+			buffer.append(record)
+			if len(buffer) >= CHUNK:
+				buffer.tofile(file)
+				count += len(buffer)
+				buffer = array.array(RECORD)
+		buffer.tofile(file)
+		count += len(buffer)
+	return count
+
+def _unique(records):
+	"Drops repeats from a sorted stream."
+	previous = None
+	for record in records:
+		if record != previous:
+			yield record
+			previous = record
+
+def _difference(records, *exclude):
+	"Yields the sorted records that are not in any of the sorted exclude streams."
+	excluded = _unique(heapq.merge(*exclude))
+	current = next(excluded, None)
+	for record in records:
+		while current is not None and current < record:
+			current = next(excluded, None)
+		if record != current:
+			yield record
+
+#______________________________________________________________________________
+
+class ExternalBFS:
+	"""Layered BFS of a SlidingPuzzle from its initial state. The layers are
+	written to directory as layer.0, layer.1, ..., and at most buffer_size
+	successors are held in memory while a layer is generated."""
+
+	def __init__(self, problem, directory, buffer_size=1 << 20):
+		self.problem = problem
+		self.directory = directory
+		self.buffer_size = buffer_size
+		self.board_mask = (1 << (4 * problem.size)) - 1
+		self.layer_sizes = []
+
+	def encode(self, state):
+		return state & self.board_mask
+
+	def decode(self, record):
+		size = self.problem.size
+		for square in range(size):
+			if (record >> (4 * square)) & 15 == 0:
+				return record | (square << (4 * size))
+
+	def _run_filename(self, created):
+		"Names a new temporary run file, and remembers it in created."
+		filename = os.path.join(self.directory, "run.%d" % len(created))
+		created.append(filename)
+		return filename
+
+	def _merge_runs(self, runs, created):
+		"""Merges the runs MERGE_FAN_IN at a time, in as many passes as it
+		takes to leave at most MERGE_FAN_IN, so the number of open files and
+		read buffers stays bounded however many runs a layer needs."""
+		while len(runs) > MERGE_FAN_IN:
+			merged = []
+			for i in range(0, len(runs), MERGE_FAN_IN):
+				group = runs[i:i + MERGE_FAN_IN]
+				if len(group) == 1:
+					merged.append(group[0])
+					continue
+				filename = self._run_filename(created)
+				write_records(filename, _unique(heapq.merge(*[read_records(run) for run in group])))
+				for run in group:
+					os.remove(run)
+				merged.append(filename)
+			runs = merged
+		return runs
+
+	def expand_layer(self, depth):
+		"""Generates layer depth + 1 from layer depth. Returns its size."""
+		runs = []
+		created = []	# Every run file made, so they are all removed at the end
+		try:
+			buffer = array.array(RECORD)
+			for record in read_records(layer_filename(self.directory, depth)):
+				for (action, state) in self.problem.successor(self.decode(record)):
+					buffer.append(self.encode(state))
+				if len(buffer) >= self.buffer_size:
+					runs.append(self._run_filename(created))
+					write_records(runs[-1], sorted(set(buffer)))
+					buffer = array.array(RECORD)
+			if buffer:
+				runs.append(self._run_filename(created))
+				write_records(runs[-1], sorted(set(buffer)))
+
+			runs = self._merge_runs(runs, created)
+			merged = _unique(heapq.merge(*[read_records(run) for run in runs]))
+			older = [read_records(layer_filename(self.directory, d))
+					 for d in range(max(0, depth - 1), depth + 1)]
+			return write_records(layer_filename(self.directory, depth + 1),
+								 _difference(merged, *older))
+		finally:
+			for filename in created:
+				if os.path.exists(filename):
+					os.remove(filename)
+
+	def run(self, max_depth=None, keep_layers=True, report=None):
+		"""Enumerates layers until one is empty or max_depth is reached, and
+		returns the list of layer sizes. Without keep_layers, layers are
+		deleted once they are no longer needed for duplicate detection.
+		report, if given, is called with (depth, size) after each layer."""
+		os.makedirs(self.directory, exist_ok=True)
+		write_records(layer_filename(self.directory, 0), [self.encode(self.problem.initial)])
+		self.layer_sizes = [1]
+		if report is not None:
+			report(0, 1)
+		depth = 0
+		while max_depth is None or depth < max_depth:
+			size = self.expand_layer(depth)
+			if not keep_layers and depth >= 1:
+				os.remove(layer_filename(self.directory, depth - 1))
+			depth += 1
+			if size == 0:
+				os.remove(layer_filename(self.directory, depth))
+				break
+			self.layer_sizes.append(size)
+			if report is not None:
+				report(depth, size)
+		return self.layer_sizes
+
+	def layer(self, depth):
+		"Yields the packed states in a layer, in sorted order of their boards."
+		for record in read_records(layer_filename(self.directory, depth)):
+			yield self.decode(record)
+
+#______________________________________________________________________________
+## Main
+
+''' Usage:
+	python extbfs.py <directory> [tiles] [buffer size] [max depth]
+Prints the size of each layer from tiles, which default to the 8-puzzle goal
+[0,1,...,8].'''
+
+def argParse(args):
+	tiles = ast.literal_eval(args[2]) if len(args) > 2 else list(range(9))
+	buffer_size = int(args[3]) if len(args) > 3 else 1 << 20
+	max_depth = int(args[4]) if len(args) > 4 else None
+	width = int(round(len(tiles) ** 0.5))
+	problem = puzzle.SlidingPuzzle(tiles, list(range(len(tiles))), width)
+
+	bfs = ExternalBFS(problem, args[1], buffer_size)
+	sizes = bfs.run(max_depth, report=lambda depth, size: print(depth, size, flush=True))
+	print("States:", sum(sizes))
+
+
+def main():
+	argParse(sys.argv)
+
+if __name__ == '__main__':
+	main()
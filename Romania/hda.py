@@ -0,0 +1,267 @@
+"""Hash-distributed A* (HDA*) across worker processes
+
+Every state is owned by one worker, picked by hashing its key. A worker keeps
+the open list and the cheapest known path cost of the states it owns, expands
+its best node, and sends each successor to the successor's owner, batched per
+owner, over that owner's inbox queue. Only the owner ever decides whether a
+path to a state is new or better, so duplicates are detected without any
+shared tables.
+
+A worker that reaches a goal publishes its cost as the incumbent, and workers
+only expand nodes with problem.h(node) below it. The search is over when every
+worker has nothing left under the incumbent and no batch is still in flight;
+the incumbent is then optimal for an admissible heuristic. The path is traced
+back by asking the owner of each state for the parent it recorded.
+
+States, the problem and its heuristic must be picklable."""
+
+import os
+import sys
+import ast
+import zlib
+import time
+import heapq
+import queue
+import itertools
+import multiprocessing
+import search
+import puzzle
+
+#______________________________________________________________________________
+
+def owner(key, workers):
+	"""The worker that owns a state key. Python salts the hashes of strings
+	per process, so anything other than an int is hashed by its repr."""
+	if isinstance(key, int):
+		# Packed puzzle states differ in few bits, so spread them out first
+		return ((key * 0x9E3779B97F4A7C15) >> 32) % workers
+	return zlib.crc32(repr(key).encode('utf-8')) % workers
+
+POLL_INTERVAL = 32		# Expansions between checks of a busy worker's inbox
+
+def _worker(index, problem, inboxes, results, traces, counters, batch_size):
+	(outstanding, sent, idle, incumbent) = counters
+	workers = len(inboxes)
+	inbox = inboxes[index]
+	best = {}		# Key of each owned state to (path cost, parent state, action)
+	frontier = []	# Heap of (f, count, path cost, state)
+	counter = itertools.count()
+	buffers = [[] for i in range(workers)]
+	expanded = 0
+	duplicates = 0
+	max_frontier = 0
+
+	def receive(state, g, parent, action):
+		nonlocal duplicates
+		key = problem.key(state)
+		entry = best.get(key)
+		if entry is not None and entry[0] <= g:
+			duplicates += 1
+			return
+		best[key] = (g, parent, action)
+		f = problem.h(search.Node(state, None, action, g))
+		heapq.heappush(frontier, (f, next(counter), g, state))
+
+	def flush(dest):
+		# The batch is counted before it is sent, so it is never invisible
+		with outstanding.get_lock():
+			outstanding.value += 1
+			sent.value += 1
+		inboxes[dest].put(("nodes", buffers[dest]))
+		buffers[dest] = []
+
+	def handle(message):
+		"Handles one message, and returns False if it says to stop."
+		nonlocal max_frontier
+		if message[0] == "stop":
+			results.put(("done", index, expanded, duplicates, max_frontier, len(best)))
+			return False
+		if message[0] == "trace":
+			(g, parent, action) = best[problem.key(message[1])]
+			traces.put((message[1], parent, action))
+			return True
+		for (state, g, parent, action) in message[1]:
+			receive(state, g, parent, action)
+		max_frontier = max(max_frontier, len(frontier))
+		with outstanding.get_lock():
+			outstanding.value -= 1
+		return True
+
+	since_poll = 0
+	while True:
+		block = not frontier or frontier[0][0] >= incumbent.value
+		if block:
+			for dest in range(workers):
+				if buffers[dest]:
+					flush(dest)
+			idle[index] = 1
+			try:
+				message = inbox.get(timeout=0.05)
+			except queue.Empty:
+				continue
+			idle[index] = 0
+			if not handle(message):
+				return
+			continue
+
+		# A busy worker reads its inbox every POLL_INTERVAL expansions, taking
+		# everything that has arrived, rather than paying for a read per node
+		if since_poll >= POLL_INTERVAL:
+			since_poll = 0
+			try:
+				while True:
+					if not handle(inbox.get_nowait()):
+						return
+			except queue.Empty:
+				pass
+			continue
+		since_poll += 1
+
+		(f, count, g, state) = heapq.heappop(frontier)
+		if best[problem.key(state)][0] < g:
+			continue	# A cheaper path to the state arrived after this one
+		expanded += 1
+		if problem.goal_test(state):
+			with incumbent.get_lock():
+				if g < incumbent.value:
+					incumbent.value = g
+					results.put(("goal", state, g))
+			continue
+
+		for (action, next_state, cost) in problem.transitions(state):
+			next_g = g + cost
+			dest = owner(problem.key(next_state), workers)
+			if dest == index:
+				receive(next_state, next_g, state, action)
+			else:
+				buffers[dest].append((next_state, next_g, state, action))
+				if len(buffers[dest]) >= batch_size:
+					flush(dest)
+		max_frontier = max(max_frontier, len(frontier))
+
+		# Keep the other workers fed while this one has a long run of local work
+		if expanded % 64 == 0:
+			for dest in range(workers):
+				if buffers[dest]:
+					flush(dest)
+
+#______________________________________________________________________________
+
+def _finished(outstanding, sent, idle):
+	"""True once every worker is idle and no batch is in flight. The sent
+	count is read on both sides of the check: a worker can only stop being
+	idle by receiving a batch, and any batch sent during the check changes it."""
+	before = sent.value
+	if outstanding.value != 0 or not all(idle):
+		return False
+	return outstanding.value == 0 and sent.value == before
+
+def hda_star_search(problem, workers=None, batch_size=64, stats=None):
+	"""A* split across worker processes. Returns (node, nodes_visited, cost,
+	stats) like the other searches, where stats["expanded"] lists each
+	worker's expansions and stats["messages"] counts the batches sent."""
+	workers = workers or os.cpu_count() or 1
+	if stats is None:
+		stats = {}
+	inboxes = [multiprocessing.Queue() for i in range(workers)]
+	results = multiprocessing.Queue()	# Goals found, then the workers' counts
+	traces = multiprocessing.Queue()	# Replies to requests for a state's parent
+	outstanding = multiprocessing.Value('q', 0)
+	sent = multiprocessing.RawValue('q', 0)		# Guarded by outstanding's lock
+	idle = multiprocessing.RawArray('b', workers)
+	incumbent = multiprocessing.Value('d', float("inf"))
+	counters = (outstanding, sent, idle, incumbent)
+
+	processes = [multiprocessing.Process(target=_worker, daemon=True,
+				 args=(i, problem, inboxes, results, traces, counters, batch_size))
+				 for i in range(workers)]
+	for process in processes:
+		process.start()
+
+	with outstanding.get_lock():
+		outstanding.value += 1
+		sent.value += 1
+	inboxes[owner(problem.key(problem.initial), workers)].put(
+		("nodes", [(problem.initial, 0, None, None)]))
+
+	while not _finished(outstanding, sent, idle):
+		time.sleep(0.002)
+		if any(not process.is_alive() for process in processes):
+			raise RuntimeError("An HDA* worker exited unexpectedly")
+
+	# Goals are reported before the incumbent is lowered, so wait for the best one
+	goal = None
+	if incumbent.value < float("inf"):
+		while goal is None or goal[2] > incumbent.value:
+			message = results.get()
+			if goal is None or message[2] < goal[2]:
+				goal = message
+
+	steps = []
+	if goal is not None:
+		state = goal[1]
+		while True:
+			inboxes[owner(problem.key(state), workers)].put(("trace", state))
+			(state, parent, action) = traces.get()
+			if parent is None:
+				break
+			steps.append((action, state))
+			state = parent
+
+	for inbox in inboxes:
+		inbox.put(("stop",))
+	stats.update({"expanded": [0] * workers, "duplicates": 0, "max_frontier": 0,
+				  "stored": 0, "messages": sent.value})
+	done = 0
+	while done < workers:
+		message = results.get()
+		if message[0] != "done":
+			continue	# A goal that was no better than the one kept
+		(kind, index, expanded, duplicates, max_frontier, stored) = message
+		done += 1
+		stats["expanded"][index] = expanded
+		stats["duplicates"] += duplicates
+		stats["max_frontier"] += max_frontier
+		stats["stored"] += stored
+	for process in processes:
+		process.join()
+
+	if goal is None:
+		print("Not Found")
+		return None
+	node = search.Node(problem.initial)
+	for (action, state) in reversed(steps):
+		node = search.Node(state, node, action,
+						   problem.path_cost(node.path_cost, node.state, action, state))
+	return node, sum(stats["expanded"]), node.path_cost, stats
+
+#______________________________________________________________________________
+## Main
+
+''' Usage:
+	python hda.py <tiles> [workers] [manhattan|misplaced|linear]
+The tiles are a list like [1,4,2,3,0,5,6,7,8]; 9 tiles are solved to
+[0,1,...,8] and 16 tiles to [0,1,...,15].'''
+
+def argParse(args):
+	tiles = ast.literal_eval(args[1])
+	workers = int(args[2]) if len(args) > 2 else None
+	heuristic = args[3] if len(args) > 3 else "manhattan"
+	width = int(round(len(tiles) ** 0.5))
+	problem = puzzle.SlidingPuzzle(tiles, list(range(len(tiles))), width, heuristic)
+	result = hda_star_search(problem, workers)
+	if result is None:
+		return
+
+	path_list = [x.action for x in result[0].path()[::-1]]
+	print("Final Path: " + " - ".join(path_list[1:]))
+	print("Cost:",result[2])
+	print("Nodes Visited:", result[1])
+	print("Worker Expansions:", result[3]["expanded"])
+
+
+def main():
+	argParse(sys.argv)
+
+if __name__ == '__main__':
+	main()
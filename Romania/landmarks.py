@@ -0,0 +1,158 @@
+"""Landmark (ALT) heuristics
+
+A few landmark states are picked and Dijkstra is run to and from each of them
+once. By the triangle inequality, the differences between those distances give
+an admissible, consistent lower bound on the distance between any two states,
+so A* can be used towards any goal and not just the one a hand-written table
+was made for."""
+
+import sys
+import json
+import array
+import search
+
+#______________________________________________________________________________
+
+class Landmarks:
+	"""Distances to and from each landmark, stored as flat arrays of doubles
+	with one row of len(landmarks) entries per state. Unreachable pairs are
+	stored as infinity."""
+
+	def __init__(self, states, landmarks, dist_from, dist_to):
+		self.states = states
+		self.landmarks = landmarks
+		self.index = {state: i for i, state in enumerate(states)}
+		self.dist_from = dist_from		# dist_from[i*k + j] is d(landmark j, state i)
+		self.dist_to = dist_to			# dist_to[i*k + j] is d(state i, landmark j)
+
+	@classmethod
+	def build(cls, graph, num_landmarks=4):
+		"""Picks landmarks from graph by farthest-point selection and
+		precomputes their distance tables."""
+		reverse = graph.reverse()
+		states = sorted(reverse.edges)
+		num_landmarks = min(num_landmarks, len(states))
+		inf = float("inf")
+
+		# Each new landmark is the state farthest from the ones chosen so far,
+		# which spreads them out towards the edges of the map
+		landmarks = []
+		from_tables = []
+		to_tables = []
+		closest = {state: inf for state in states}
+		candidate = states[0]
+		while len(landmarks) < num_landmarks:
+			landmarks.append(candidate)
+			from_tables.append(search.dijkstra(graph, candidate))
+			to_tables.append(search.dijkstra(reverse, candidate))
+			for state in states:
+				closest[state] = min(closest[state], from_tables[-1].get(state, inf))
+			remaining = [state for state in states if state not in landmarks]
+			if not remaining:
+				break
+			# Unreachable states count as closest so they are never picked
+			candidate = max(remaining, key=lambda state:
+							closest[state] if closest[state] < inf else -1)
+
+		k = len(landmarks)
+		dist_from = array.array('d', [inf]) * (len(states) * k)
+		dist_to = array.array('d', [inf]) * (len(states) * k)
+		for i, state in enumerate(states):
+			for j in range(k):
+				dist_from[i*k + j] = from_tables[j].get(state, inf)
+				dist_to[i*k + j] = to_tables[j].get(state, inf)
+		return cls(states, landmarks, dist_from, dist_to)
+
+	def estimate(self, state1, state2):
+		"""Lower bound on the cost of a path from state1 to state2."""
+		k = len(self.landmarks)
+		i = self.index[state1] * k
+		t = self.index[state2] * k
+		dist_from = self.dist_from
+		dist_to = self.dist_to
+		inf = float("inf")
+		best = 0
+		for j in range(k):
+			# d(L,t) - d(L,s) <= d(s,t)
+			a = dist_from[t + j]; b = dist_from[i + j]
+			if a < inf and b < inf and a - b > best:
+				best = a - b
+			# d(s,L) - d(t,L) <= d(s,t)
+			a = dist_to[i + j]; b = dist_to[t + j]
+			if a < inf and b < inf and a - b > best:
+				best = a - b
+		return best
+
+	# The file is a line of JSON with the states and landmarks, followed by
+	# the two distance arrays as raw doubles
+	def save(self, filename):
+		with open(filename, 'wb') as file:
+			header = {"states": self.states, "landmarks": self.landmarks}
+			file.write(json.dumps(header).encode('utf-8') + b'\n')
+			self.dist_from.tofile(file)
+			self.dist_to.tofile(file)
+
+	@classmethod
+	def load(cls, filename):
+		with open(filename, 'rb') as file:
+			header = json.loads(file.readline().decode('utf-8'))
+			states = header["states"]
+			landmarks = header["landmarks"]
+			size = len(states) * len(landmarks)
+			dist_from = array.array('d')
+			dist_from.fromfile(file, size)
+			dist_to = array.array('d')
+			dist_to.fromfile(file, size)
+		return cls(states, landmarks, dist_from, dist_to)
+
+#______________________________________________________________________________
+
+class LandmarkProblem(search.RomaniaProblem):
+	"""A RomaniaProblem for any goal city, using landmark distances in place
+	of the straight line distance table."""
+
+	def __init__(self, initial, goal, landmarks, map_file=None):
+		super().__init__(initial, goal, map_file)
+		self.landmarks = landmarks
+
+	def h(self, node):
+		return self.landmarks.estimate(node.state, self.goal) + node.path_cost
+
+	def estimate(self, state1, state2):
+		return self.landmarks.estimate(state1, state2)
+
+#______________________________________________________________________________
+## Main
+
+''' Usage:
+	python landmarks.py build <landmark file> [number of landmarks]
+	python landmarks.py <landmark file> <astar|biastar> <origin> <destination>'''
+
+def argParse(args):
+	if args[1] == "build":
+		num_landmarks = int(args[3]) if len(args) > 3 else 4
+		landmarks = Landmarks.build(search.RomaniaProblem(None, None).map, num_landmarks)
+		landmarks.save(args[2])
+		print("Landmarks:", ", ".join(landmarks.landmarks))
+
+	else:
+		problem = LandmarkProblem(args[3], args[4], Landmarks.load(args[1]))
+		if args[2] == "astar":
+			result = search.astar_search(problem)
+		elif args[2] == "biastar":
+			result = search.bidirectional_astar(problem)
+		else:
+			print("Invalid Argument: "+args[2]+" is not a valid algorithm")
+			return
+
+		path_list = [x.state for x in result[0].path()[::-1]]
+		print("Final Path: " + " - ".join(path_list))
+		print("Cost:",result[2])
+		print("Nodes Visited:", result[1])
+
+
+def main():
+	argParse(sys.argv)
+
+if __name__ == '__main__':
+	main()
@@ -0,0 +1,98 @@
+"""Loads adjacency list maps, such as romania_adjacency_list.csv, into a dict
+of city to a list of (neighbouring city, cost) tuples.
+
+Parsed maps are cached in memory, so every problem built on the same file
+shares one copy, and on disk next to the file in pickle format, so a new
+process doesn't have to parse it again. Both caches are checked against the
+file's modification time and size, and the disk cache falls back to a hash of
+the contents when those have changed but the data may not have (e.g. after a
+fresh checkout)."""
+
+import os
+import csv
+import pickle
+import hashlib
+
+CACHE_VERSION = 1
+
+_maps = {}	# Absolute path to ((mtime, size), edges)
+
+def load(filename, use_disk_cache=True):
+	"""Returns the edges of the map in filename. The result is shared between
+	callers and must not be modified."""
+	path = os.path.abspath(filename)
+	stat = os.stat(path)
+	signature = (stat.st_mtime_ns, stat.st_size)
+
+	cached = _maps.get(path)
+	if cached is not None and cached[0] == signature:
+		return cached[1]
+
+	edges = None
+	if use_disk_cache:
+		edges = _read_cache(path, signature)
+	if edges is None:
+		edges = parse(path)
+		if use_disk_cache:
+			_write_cache(path, signature, _file_hash(path), edges)
+
+	_maps[path] = (signature, edges)
+	return edges
+
+def parse(filename):
+	"Parses the file one row at a time."
+	edges = {}
+	with open(filename, newline='') as file:
+		for row in csv.reader(file):
+			if not row:
+				continue
+			edges[row[0]] = [(row[i], int(row[i+1])) for i in range(1, len(row), 2)]
+	return edges
+
+def clear():
+	"Empties the in-memory cache."
+	_maps.clear()
+
+def cache_filename(filename):
+	return filename + ".cache"
+
+def _file_hash(path):
+	sha = hashlib.sha1()
+	with open(path, 'rb') as file:
+		for block in iter(lambda: file.read(1 << 20), b''):
+			sha.update(block)
+	return sha.hexdigest()
+
+def _read_cache(path, signature):
+	try:
+		with open(cache_filename(path), 'rb') as file:
+			header = pickle.load(file)
+			if header.get("version") != CACHE_VERSION:
+				return None
+			if header["signature"] != signature:
+				# Touched but maybe not changed; only reparse if the contents differ
+				if header["hash"] != _file_hash(path):
+					return None
+				edges = pickle.load(file)
+				_write_cache(path, signature, header["hash"], edges)
+				return edges
+			return pickle.load(file)
+	except (OSError, EOFError, pickle.UnpicklingError, KeyError, AttributeError):
+		return None
+
+def _write_cache(path, signature, file_hash, edges):
+	# Written to a temporary file first so readers never see half a cache
+	cache = cache_filename(path)
+	temp = cache + ".%d.tmp" % os.getpid()
+	header = {"version": CACHE_VERSION, "signature": signature, "hash": file_hash}
+	try:
+		with open(temp, 'wb') as file:
+			pickle.dump(header, file, pickle.HIGHEST_PROTOCOL)
+			pickle.dump(edges, file, pickle.HIGHEST_PROTOCOL)
+		os.replace(temp, cache)
+	except OSError:
+		# The cache is only an optimization, e.g. the directory may be read-only
+		try:
+			os.remove(temp)
+		except OSError:
+			pass
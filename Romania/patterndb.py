@@ -0,0 +1,192 @@
+"""Additive pattern databases for sliding tile puzzles
+
+The tiles are split into disjoint patterns. For each pattern, a breadth-first
+search backwards from the goal over the abstract puzzle, where every other tile
+is indistinguishable from the blank, finds how many moves of the pattern's own
+tiles it takes to get them home from every placement. Only moves of pattern
+tiles are counted, so the values of disjoint patterns can be added and still
+never overestimate.
+
+Each table is a flat byte array indexed by the squares of the pattern's tiles
+read as digits in base (number of squares). Tables are saved with a one line
+JSON header and memory-mapped when they are loaded, so large tables are shared
+between processes and paged in only as needed."""
+
+import sys
+import ast
+import json
+import mmap
+import collections
+import puzzle
+import search
+
+UNKNOWN = 255
+
+DEFAULT_PATTERNS = {
+	3: [[1, 2, 3, 4], [5, 6, 7, 8]],
+	4: [[1, 2, 3, 4, 5], [6, 7, 8, 9, 10], [11, 12, 13, 14, 15]],
+}
+
+#______________________________________________________________________________
+
+class PatternDatabase:
+
+	def __init__(self, width, pattern, table):
+		self.width = width
+		self.size = width * width
+		self.pattern = pattern
+		self.table = table
+		self.powers = [self.size ** i for i in range(len(pattern))]
+
+	@classmethod
+	def build(cls, width, goal, pattern):
+		"""Fills the table by a 0-1 breadth-first search from goal: moving the
+		blank onto a non-pattern square is free, moving a pattern tile costs 1.
+		The abstract state also needs the blank's square, but the table only
+		keeps the cheapest value over all blank squares."""
+		size = width * width
+		k = len(pattern)
+		powers = [size ** i for i in range(k)]
+		neighbors = []
+		for square in range(size):
+			row, col = divmod(square, width)
+			adjacent = []
+			if row > 0: adjacent.append(square - width)
+			if row < width - 1: adjacent.append(square + width)
+			if col > 0: adjacent.append(square - 1)
+			if col < width - 1: adjacent.append(square + 1)
+			neighbors.append(adjacent)
+
+		start = 0
+		for i, tile in enumerate(pattern):
+			start += goal.index(tile) * powers[i]
+		start = start * size + goal.index(0)
+
+		table = bytearray([UNKNOWN]) * (size ** k)
+		dist = bytearray([UNKNOWN]) * (size ** k * size)	# Indexed by pattern index * size + blank
+		dist[start] = 0
+		frontier = collections.deque([start])
+
+		while frontier:
+			state = frontier.popleft()
+			d = dist[state]
+			index, blank = divmod(state, size)
+			if d < table[index]:
+				table[index] = d
+			squares = [(index // powers[i]) % size for i in range(k)]
+
+			for square in neighbors[blank]:
+				if square in squares:
+					# The pattern tile on square slides into the blank
+					i = squares.index(square)
+					next = (index + (blank - square) * powers[i]) * size + square
+					if d + 1 < dist[next]:
+						dist[next] = d + 1
+						frontier.append(next)
+				else:
+					next = index * size + square
+					if d < dist[next]:
+						dist[next] = d
+						frontier.appendleft(next)
+		return cls(width, pattern, table)
+
+	def lookup(self, squares):
+		"""squares[tile] is the square of each tile."""
+		index = 0
+		for i, tile in enumerate(self.pattern):
+			index += squares[tile] * self.powers[i]
+		return self.table[index]
+
+	def save(self, filename):
+		with open(filename, 'wb') as file:
+			header = {"width": self.width, "pattern": self.pattern}
+			file.write(json.dumps(header).encode('utf-8') + b'\n')
+			file.write(self.table)
+
+	@classmethod
+	def load(cls, filename):
+		with open(filename, 'rb') as file:
+			header = json.loads(file.readline().decode('utf-8'))
+			offset = file.tell()
+			mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+		return cls(header["width"], header["pattern"], memoryview(mapped)[offset:])
+
+#______________________________________________________________________________
+
+class PatternDatabases:
+	"""The sum of a set of disjoint pattern databases."""
+
+	def __init__(self, databases):
+		self.databases = databases
+		self.size = databases[0].size
+
+	@classmethod
+	def build(cls, width, goal, patterns=None):
+		if patterns is None:
+			patterns = DEFAULT_PATTERNS[width]
+		return cls([PatternDatabase.build(width, goal, pattern) for pattern in patterns])
+
+	def value(self, state):
+		"Returns the heuristic value of a packed puzzle state."
+		squares = [0] * self.size
+		for square in range(self.size):
+			squares[(state >> (4 * square)) & 15] = square
+		total = 0
+		for database in self.databases:
+			total += database.lookup(squares)
+		return total
+
+	def save(self, prefix):
+		for i, database in enumerate(self.databases):
+			database.save("%s.%d.pdb" % (prefix, i))
+
+	@classmethod
+	def load(cls, prefix, count):
+		return cls([PatternDatabase.load("%s.%d.pdb" % (prefix, i)) for i in range(count)])
+
+#______________________________________________________________________________
+
+class PatternDatabasePuzzle(puzzle.SlidingPuzzle):
+	"""A SlidingPuzzle using additive pattern databases for h. The goal must
+	be the one the databases were built for."""
+
+	def __init__(self, initial, goal, databases, width=3):
+		super().__init__(initial, goal, width)
+		self.databases = databases
+
+	def h(self, node):
+		return self.databases.value(node.state) + node.path_cost
+
+#______________________________________________________________________________
+## Main
+
+''' Usage:
+	python patterndb.py build <width> <prefix>		builds the default patterns
+	python patterndb.py <prefix> <count> <tiles>		solves with A*'''
+
+def argParse(args):
+	if args[1] == "build":
+		width = int(args[2])
+		goal = list(range(width * width))
+		databases = PatternDatabases.build(width, goal)
+		databases.save(args[3])
+		print("Patterns:", [database.pattern for database in databases.databases])
+
+	else:
+		databases = PatternDatabases.load(args[1], int(args[2]))
+		tiles = ast.literal_eval(args[3])
+		width = databases.databases[0].width
+		problem = PatternDatabasePuzzle(tiles, list(range(len(tiles))), databases, width)
+		result = search.astar_search(problem)
+
+		path_list = [x.action for x in result[0].path()[::-1]]
+		print("Final Path: " + " - ".join(path_list[1:]))
+		print("Cost:",result[2])
+		print("Nodes Visited:", result[1])
+
+
+def main():
+	argParse(sys.argv)
+
+if __name__ == '__main__':
+	main()
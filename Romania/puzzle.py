@@ -0,0 +1,185 @@
+"""Sliding tile puzzles with packed integer states
+
+A state is a single int: the tile at board position i is stored in bits
+4*i to 4*i+3, and the position of the blank in the bits above the board. This
+makes states hashable and cheap to copy, a move is a couple of shifts, and the
+moves available from each blank position are worked out once up front.
+Heuristics are updated incrementally from the parent's value using a table of
+how much each tile's contribution changes when it moves between two squares.
+
+Works for the 8-puzzle (width 3) and the 15-puzzle (width 4)."""
+
+import sys
+import ast
+import search
+
+#______________________________________________________________________________
+
+def pack(tiles):
+	"Packs a list of tiles, 0 being the blank, into a state."
+	state = 0
+	for i, tile in enumerate(tiles):
+		state |= tile << (4 * i)
+	return state | (tiles.index(0) << (4 * len(tiles)))
+
+def unpack(state, size=9):
+	"Returns the list of tiles in a state."
+	return [(state >> (4 * i)) & 15 for i in range(size)]
+
+def blank(state, size=9):
+	return state >> (4 * size)
+
+def solvable(tiles, goal, width=3):
+	"""True if goal can be reached from tiles. A move swaps the blank with a
+	tile, so it changes the parity of the permutation of the other tiles by
+	width - 1 for a vertical move and not at all for a horizontal one. With
+	an odd width that parity never changes. With an even width, the parity
+	plus the blank's row never changes."""
+	def parity(tiles):
+		order = [tile for tile in tiles if tile != 0]
+		inversions = sum(1 for i in range(len(order)) for j in range(i + 1, len(order))
+						 if order[i] > order[j])
+		if width % 2 == 0:
+			inversions += tiles.index(0) // width
+		return inversions % 2
+	return parity(list(tiles)) == parity(list(goal))
+
+#______________________________________________________________________________
+
+class SlidingPuzzle(search.Problem):
+	"""initial and goal are lists of tiles like EightPuzzle's, and are
+	packed. heuristic is "manhattan", "misplaced" or "linear" (Manhattan plus
+	linear conflicts)."""
+
+	def __init__(self, initial, goal, width=3, heuristic="manhattan"):
+		super().__init__(pack(initial), pack(goal))
+		self.width = width
+		self.size = width * width
+		self.goal_tiles = list(goal)
+		self.linear = heuristic == "linear"
+
+		# moves[b] lists (action, new blank position) for the blank at b
+		self.moves = []
+		for b in range(self.size):
+			row, col = divmod(b, width)
+			moves = []
+			if row > 0:
+				moves.append(("Up", b - width))
+			if row < width - 1:
+				moves.append(("Down", b + width))
+			if col > 0:
+				moves.append(("Left", b - 1))
+			if col < width - 1:
+				moves.append(("Right", b + 1))
+			self.moves.append(moves)
+
+		# cost[tile][square] is the tile's heuristic contribution on that square
+		goal_square = [0] * self.size
+		for square, tile in enumerate(goal):
+			goal_square[tile] = square
+		self.cost = [[0] * self.size for tile in range(self.size)]
+		for tile in range(1, self.size):
+			grow, gcol = divmod(goal_square[tile], width)
+			for square in range(self.size):
+				row, col = divmod(square, width)
+				if heuristic in ["manhattan", "linear"]:
+					self.cost[tile][square] = abs(row - grow) + abs(col - gcol)
+				else:
+					self.cost[tile][square] = int(square != goal_square[tile])
+
+	def successor(self, state):
+		b = state >> (4 * self.size)
+		board = state & ((1 << (4 * self.size)) - 1)
+		result = []
+		for (action, nb) in self.moves[b]:
+			# The blank's nibble is 0, so the tile just moves across
+			tile = (board >> (4 * nb)) & 15
+			next = board - (tile << (4 * nb)) + (tile << (4 * b))
+			result.append((action, next | (nb << (4 * self.size))))
+		return result
+
+	def transitions(self, state):
+		size = self.size
+		b = state >> (4 * size)
+		board = state & ((1 << (4 * size)) - 1)
+		for (action, nb) in self.moves[b]:
+			tile = (board >> (4 * nb)) & 15
+			yield (action, (board - (tile << (4 * nb)) + (tile << (4 * b))) | (nb << (4 * size)), 1)
+
+	def path_cost(self, c, state1, action, state2):
+		return c + 1
+
+	def heuristic(self, state):
+		"Computes the heuristic of a state from scratch."
+		total = 0
+		for square in range(self.size):
+			tile = (state >> (4 * square)) & 15
+			total += self.cost[tile][square]
+		return total
+
+	# Only one tile moves per step, so the parent's value is updated with that
+	# tile's change instead of rescanning the board. The value is kept on the
+	# node as node.h. Linear conflicts are added on top from scratch.
+	def h(self, node):
+		parent = node.parent
+		if parent is None or not hasattr(parent, "h"):
+			node.h = self.heuristic(node.state)
+		else:
+			# The tile moved from where the blank is now to where it was
+			size = self.size
+			nb = node.state >> (4 * size)
+			b = parent.state >> (4 * size)
+			tile = (node.state >> (4 * b)) & 15
+			node.h = parent.h - self.cost[tile][nb] + self.cost[tile][b]
+		if self.linear:
+			tiles = unpack(node.state, self.size)
+			return node.h + search.linear_conflict(tiles, self.goal_tiles, self.width) + node.path_cost
+		return node.h + node.path_cost
+
+#______________________________________________________________________________
+## Main
+
+''' Usage:
+	python puzzle.py <bfs|dfs|astar|idastar|rbfs|smastar|arastar> <tiles> [manhattan|misplaced|linear] [seconds]
+The tiles are a list like [1,4,2,3,0,5,6,7,8]; 9 tiles are solved to
+[0,1,...,8] and 16 tiles to [0,1,...,15]. arastar stops improving its path
+after the given number of seconds.'''
+
+def argParse(args):
+	tiles = ast.literal_eval(args[2])
+	width = int(round(len(tiles) ** 0.5))
+	heuristic = args[3] if len(args) > 3 else "manhattan"
+	problem = SlidingPuzzle(tiles, list(range(len(tiles))), width, heuristic)
+
+	if args[1] == "bfs":
+		result = search.breadth_first_search(problem)
+	elif args[1] == "dfs":
+		result = search.depth_first_search(problem)
+	elif args[1] == "astar":
+		result = search.astar_search(problem)
+	elif args[1] == "idastar":
+		result = search.iterative_deepening_astar(problem)
+	elif args[1] == "rbfs":
+		result = search.recursive_best_first_search(problem)
+	elif args[1] == "smastar":
+		result = search.sma_star_search(problem)
+	elif args[1] == "arastar":
+		time_limit = float(args[4]) if len(args) > 4 else None
+		result = search.ara_star_search(problem, time_limit=time_limit)
+	else:
+		print("Invalid Argument: "+args[1]+" is not a valid algorithm")
+		return
+
+	path_list = [x.action for x in result[0].path()[::-1]]
+	print("Final Path: " + " - ".join(path_list[1:]))
+	print("Cost:",result[2])
+	print("Nodes Visited:", result[1])
+	if args[1] == "arastar":
+		print("Suboptimality Bound:", result[3]["bound"])
+
+
+def main():
+	argParse(sys.argv)
+
+if __name__ == '__main__':
+	main()
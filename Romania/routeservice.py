@@ -0,0 +1,214 @@
+"""A long-lived route finding service
+
+RouteService loads a map once and answers origin/destination queries from a
+pool of worker processes, so a batch of queries is searched on as many cores
+as there are workers. Each worker loads the map and builds any landmark
+tables or contraction hierarchy its algorithms need the first time it uses
+them. Answers are kept in an LRU cache keyed by (origin, goal, algorithm).
+
+Queries can come from the library API, or as JSON lines on stdin or a local
+TCP socket. Each line holds one query object, e.g.
+	{"origin": "Arad", "goal": "Eforie", "algorithm": "astar"}
+or a list of them, and is answered with one line of JSON in the same shape."""
+
+import sys
+import json
+import threading
+import contextlib
+import socketserver
+import concurrent.futures
+import search
+import structs
+import landmarks
+import contraction
+
+ALGORITHMS = ["bfs", "dfs", "astar", "biucs", "biastar", "ch"]
+
+#______________________________________________________________________________
+
+class RouteSearcher:
+	"""Runs the searches for one worker process, keeping the map and the
+	preprocessing for the algorithms that need it."""
+
+	def __init__(self, map_file=None, num_landmarks=4):
+		self.map_file = map_file
+		self.map = search.RomaniaProblem(None, None, map_file).map
+		self.num_landmarks = num_landmarks
+		self.landmarks = None
+		self.hierarchy = None
+
+	# Preprocessing is only done the first time an algorithm that needs it is used
+	def _get_landmarks(self):
+		if self.landmarks is None:
+			self.landmarks = landmarks.Landmarks.build(self.map, self.num_landmarks)
+		return self.landmarks
+
+	def _get_hierarchy(self):
+		if self.hierarchy is None:
+			self.hierarchy = contraction.ContractionHierarchy.build(self.map)
+		return self.hierarchy
+
+	def search(self, origin, goal, algorithm):
+		"""Returns the result dict for a valid query."""
+		result = {"origin": origin, "goal": goal, "algorithm": algorithm}
+		# The searches print "Not Found", which must not end up among the responses
+		with contextlib.redirect_stdout(sys.stderr):
+			if algorithm == "ch":
+				found = self._get_hierarchy().query(origin, goal)
+			elif algorithm in ["astar", "biastar"]:
+				problem = landmarks.LandmarkProblem(origin, goal, self._get_landmarks(), self.map_file)
+				if algorithm == "astar":
+					found = search.astar_search(problem)
+				else:
+					found = search.bidirectional_astar(problem)
+			else:
+				problem = search.RomaniaProblem(origin, goal, self.map_file)
+				if algorithm == "bfs":
+					found = search.breadth_first_search(problem)
+				elif algorithm == "dfs":
+					found = search.depth_first_search(problem)
+				else:
+					found = search.bidirectional_ucs(problem)
+
+		if found is None:
+			result["error"] = "Not Found"
+		else:
+			result["path"] = [x.state for x in found[0].path()[::-1]]
+			result["cost"] = found[2]
+			result["nodes_visited"] = found[1]
+		return result
+
+# The searcher of the current worker process, set up by _init_worker
+_searcher = None
+
+def _init_worker(map_file, num_landmarks):
+	global _searcher
+	_searcher = RouteSearcher(map_file, num_landmarks)
+
+def _search(origin, goal, algorithm):
+	return _searcher.search(origin, goal, algorithm)
+
+#______________________________________________________________________________
+
+class RouteService:
+
+	def __init__(self, map_file=None, workers=4, cache_size=4096, num_landmarks=4):
+		self.map_file = map_file
+		self.map = search.RomaniaProblem(None, None, map_file).map
+		self.cache = structs.LRUCache(cache_size)
+		self.cache_lock = threading.Lock()	# The cache is shared by the server's threads
+		self.pool = concurrent.futures.ProcessPoolExecutor(
+			max_workers=workers, initializer=_init_worker, initargs=(map_file, num_landmarks))
+
+	def query(self, origin, goal, algorithm="astar"):
+		"""Returns a dict with the path, cost and nodes visited for the route
+		from origin to goal, or with an error message."""
+		return self.query_batch([(origin, goal, algorithm)])[0]
+
+	def query_batch(self, queries):
+		"""Answers a list of (origin, goal, algorithm) tuples concurrently,
+		returning the results in the same order."""
+		results = []
+		for (origin, goal, algorithm) in queries:
+			result = self._check(origin, goal, algorithm)
+			if result is None:
+				with self.cache_lock:
+					result = self.cache.get((origin, goal, algorithm))
+			if result is None:
+				result = self.pool.submit(_search, origin, goal, algorithm)
+			results.append(result)
+
+		for i, result in enumerate(results):
+			if isinstance(result, concurrent.futures.Future):
+				results[i] = result = result.result()
+				if "error" not in result:
+					with self.cache_lock:
+						self.cache.put((result["origin"], result["goal"], result["algorithm"]), result)
+		return results
+
+	def stats(self):
+		with self.cache_lock:
+			return {"hits": self.cache.stats["hits"], "misses": self.cache.stats["misses"],
+					"cached": len(self.cache)}
+
+	def close(self):
+		self.pool.shutdown()
+
+	# Returns an error result for a query that cannot be searched, or None
+	def _check(self, origin, goal, algorithm):
+		result = {"origin": origin, "goal": goal, "algorithm": algorithm}
+		for city in (origin, goal):
+			if not isinstance(city, str) or city not in self.map.edges:
+				result["error"] = str(city)+" is not a valid city"
+				return result
+		if not isinstance(algorithm, str) or algorithm not in ALGORITHMS:
+			result["error"] = str(algorithm)+" is not a valid algorithm"
+			return result
+		return None
+
+	def handle_line(self, line):
+		"Answers one line of the JSON line protocol."
+		try:
+			request = json.loads(line)
+		except ValueError:
+			return json.dumps({"error": "Invalid JSON"})
+		if isinstance(request, list) and all(isinstance(q, dict) for q in request):
+			queries = [(q.get("origin"), q.get("goal"), q.get("algorithm", "astar"))
+					   for q in request]
+			return json.dumps(self.query_batch(queries))
+		if not isinstance(request, dict):
+			return json.dumps({"error": "Expected a query object or a list of them"})
+		return json.dumps(self.query(request.get("origin"), request.get("goal"),
+									 request.get("algorithm", "astar")))
+
+#______________________________________________________________________________
+
+class RouteRequestHandler(socketserver.StreamRequestHandler):
+
+	def handle(self):
+		for line in self.rfile:
+			line = line.decode('utf-8').strip()
+			if line:
+				response = self.server.service.handle_line(line)
+				self.wfile.write(response.encode('utf-8') + b'\n')
+
+
+class RouteServer(socketserver.ThreadingTCPServer):
+	allow_reuse_address = True
+	daemon_threads = True
+
+	def __init__(self, address, service):
+		super().__init__(address, RouteRequestHandler)
+		self.service = service
+
+#______________________________________________________________________________
+## Main
+
+''' Usage:
+	python routeservice.py [map csv]				answers JSON lines from stdin
+	python routeservice.py --port <port> [map csv]	listens on localhost'''
+
+def argParse(args):
+	port = None
+	if len(args) > 2 and args[1] == "--port":
+		port = int(args[2])
+		args = args[:1] + args[3:]
+	map_file = args[1] if len(args) > 1 else None
+	service = RouteService(map_file)
+
+	if port is not None:
+		with RouteServer(("127.0.0.1", port), service) as server:
+			server.serve_forever()
+	else:
+		for line in sys.stdin:
+			line = line.strip()
+			if line:
+				print(service.handle_line(line), flush=True)
+	service.close()
+
+
+def main():
+	argParse(sys.argv)
+
+if __name__ == '__main__':
+	main()
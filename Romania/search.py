@@ -4,10 +4,15 @@ The way to use this code is to subclass Problem to create a class of problems,
 then create problem instances and solve them with calls to the various search
 functions."""
 
+import os
 import sys
-import csv
 import ast
+import json
+import time
+import heapq
+import itertools
 import structs
+import maploader
 
 #______________________________________________________________________________
 
@@ -30,6 +35,17 @@ class Problem:
 		that yields the successors one at a time, rather than building them
 		all at once. Iterators will work fine within the framework."""
 		raise NotImplementedError("successor() must be implemented in subclass")
+
+	def transitions(self, state):
+		"""Yield (action, next state, step cost) triples for the successors of
+		state. This is what the search functions expand nodes with, so it is
+		the method to implement when successors can be produced lazily and
+		their costs are at hand. The default method pairs up successor() with
+		path_cost(0, ...), which assumes the cost of a step does not depend on
+		the cost of the path before it."""
+		path_cost = self.path_cost
+		for (action, next) in self.successor(state):
+			yield (action, next, path_cost(0, state, action, next))
 	
 	def goal_test(self, state):
 		"""Return True if the state is a goal. The default method compares the
@@ -46,9 +62,23 @@ class Problem:
 		return c + 1
 		
 	def h(self, node):
-		"""Return the heuristic function value for a particular node. Implement
-		this if using informed (heuristic) search."""
-		return 0
+		"""Return the priority of a node for informed search: its path cost
+		plus an estimate of the cost from its state to a goal. Implement this
+		if using informed (heuristic) search. The default estimate is 0."""
+		return node.path_cost
+
+	def cost_to_go(self, node):
+		"""Return the estimate of the cost from node's state to a goal alone,
+		not counting node.path_cost. It is taken out of h(node), so h is the
+		only method a problem needs to implement for its heuristic."""
+		return self.h(node) - node.path_cost
+
+	def key(self, state):
+		"""Return a hashable key identifying state, used by the search functions
+		to track explored states and frontier membership in sets and dicts.
+		The default method returns the state itself; override it if states are
+		unhashable (e.g. lists)."""
+		return state
 #______________________________________________________________________________
 
 class Graph:
@@ -56,51 +86,72 @@ class Graph:
 	# It's just a dictionary
 	def __init__(self):
 		self.edges = {}
+		self._reversed = None	# (edges, reversed graph) from the last reverse()
 
 	# Returns the value of the given state
 	def neighbors(self, state):
 		return self.edges[state]
 
+	# Returns a graph with every edge pointing the other way, for searching
+	# backwards from a goal. It is built once and reused until self.edges is
+	# replaced, so neither graph's edges should be modified in place.
+	def reverse(self):
+		if self._reversed is None or self._reversed[0] is not self.edges:
+			result = Graph()
+			for state in self.edges:
+				result.edges.setdefault(state, [])
+				for (next, cost) in self.edges[state]:
+					result.edges.setdefault(next, []).append((state, cost))
+			self._reversed = (self.edges, result)
+		return self._reversed[1]
+
 #______________________________________________________________________________
 
 
 class RomaniaProblem(Problem):
 
-	def __init__(self, initial, goal):
+	# Straight line distances to Bucharest
+	heuristic = {"Arad": 366, "Bucharest": 0, "Craiova": 160,
+	"Drobeta": 242, "Eforie": 161, "Fagaras": 176, "Giurgiu": 77,
+	"Hirsova": 151, "Iasi": 226, "Lugoj": 244, "Mehadia": 241,
+	"Neamt": 234, "Oradea": 380, "Pitesti": 100, "Rimnicu Vilcea": 193,
+	"Sibiu": 253, "Timisoara": 329, "Urziceni": 80, "Vaslui": 199,
+	"Zerind": 374}
+
+	map_file = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'romania_adjacency_list.csv')
+
+	# map_file defaults to the map of Romania next to this file
+	def __init__(self, initial, goal, map_file=None):
 		super().__init__(initial, goal)
+		if map_file is not None:
+			self.map_file = map_file
 		self.map = self.createMap()
 		self.path = []
-		self.heuristic = {"Arad": 366, "Bucharest": 0, "Craiova": 160,
-		"Drobeta": 242, "Eforie": 161, "Fagaras": 176, "Giurgiu": 77,
-		"Hirsova": 151, "Iasi": 226, "Lugoj": 244, "Mehadia": 241,
-		"Neamt": 234, "Oradea": 380, "Pitesti": 100, "Rimnicu Vilcea": 193,
-		"Sibiu": 253, "Timisoara": 329, "Urziceni": 80, "Vaslui": 199,
-		"Zerind": 374}
 
 	# Creates the map of Romania using the csv file. Stores them in the graph class, with
 	# cities as keys, and their values as lists of tuples containing possible destinations and
 	# path costs. So the value of "Arad" would be: [('Sibiu', 140), ('Timisoara', 118), ('Zerind', 75)].
+	# The parsed file is cached by maploader, so problems built on the same map share it,
+	# and they share one Graph on it too, so its reverse is only built once.
+	_graphs = {}	# Map file to the Graph of its edges
+
 	def createMap(self):
-		map = Graph()
-		tuple_list = []
-		with open('romania_adjacency_list.csv') as file:
-			reader = csv.reader(file)
-			for row in reader:
-				rowlen = len(row)
-				city = row[0]
-				for i in range(1, rowlen, 2):
-					tuple_list.append((row[i], int(row[i+1])))
-				map.edges[city] = tuple_list
-				tuple_list = []
+		edges = maploader.load(self.map_file)
+		map = RomaniaProblem._graphs.get(self.map_file)
+		if map is None or map.edges is not edges:
+			map = Graph()
+			map.edges = edges
+			RomaniaProblem._graphs[self.map_file] = map
 		return map
 
 
+	# The action is the name of the city being driven to
 	def successor(self, state):
-		state_action_list = []
-		for city in self.map.neighbors(state):
-			state_action_list.append(("ACTION", city[0]))
+		return [(city, city) for (city, cost) in self.map.neighbors(state)]
 
-		return state_action_list
+	def transitions(self, state):
+		for (city, cost) in self.map.neighbors(state):
+			yield (city, city, cost)
 	
 	def path_cost(self, c, state1, action, state2):
 
@@ -117,37 +168,37 @@ class RomaniaProblem(Problem):
 	def h(self, node):
 		return self.heuristic[node.state] + node.path_cost
 
+	# Lower bound on the road distance between any two cities. The table holds
+	# straight line distances to Bucharest, so by the triangle inequality the
+	# difference of two entries never exceeds the distance between the cities.
+	def estimate(self, state1, state2):
+		return abs(self.heuristic[state1] - self.heuristic[state2])
+
 
 #______________________________________________________________________________
 
 class EightPuzzle(Problem):
-	def __init__(self, initial, goal):
+	# heuristic is "misplaced", "manhattan" or "linear" (Manhattan plus linear conflicts)
+	def __init__(self, initial, goal, heuristic="misplaced"):
 		super().__init__(initial, goal)
+		self.heuristic = heuristic
 
+	# Number of tiles (not the blank) that are not on their goal square
 	def out_of_place(self, state):
-		goal = [0,1,2,3,4,5,6,7,8]
 		out_of_place = 0
 		for i in range(0, len(state)):
-			if state[i] != goal[i]:
+			if state[i] != 0 and state[i] != self.goal[i]:
 				out_of_place += 1
 		return out_of_place
 
-	# Not working
+	# Sum of the distances of each tile (not the blank) from its goal square
 	def manhattan(self, state):
-		goal = [[0,1,2],[3,4,5],[6,7,8]]
-		state = [state[i:i+3] for i in range(0,len(state),3)]
-		mhd = 0
-		for x in range(3):
-			for y in range(3):
-				if state[x][y] != goal[x][y]:
-					value = state[x][y]
-					xstart = x
-					ystart = y
-					xgoal = goal.index(x)
-					ygoal = goal.index(y)
-					dist = abs(xgoal - xstart) + abs(ygoal - ystart)
-					mhd += dist
-		return mhd
+		return manhattan(state, self.goal)
+
+	# Manhattan distance plus two moves for every tile that has to leave its
+	# row or column to get past another tile headed the other way
+	def linear_conflict(self, state):
+		return manhattan(state, self.goal) + linear_conflict(state, self.goal)
 
 	def successor(self, state):
 		zero_index = state.index(0)
@@ -182,9 +233,63 @@ class EightPuzzle(Problem):
 	def path_cost(self, c, state1, action, state2):
 		return c + 1
 
-	# Heuristic is number of squares out of place
+	# States are lists, so use a tuple as the hashable key
+	def key(self, state):
+		return tuple(state)
+
+	# Heuristic is number of squares out of place by default
 	def h(self, node):
-		return self.out_of_place(node.state)
+		if self.heuristic == "manhattan":
+			return self.manhattan(node.state) + node.path_cost
+		if self.heuristic == "linear":
+			return self.linear_conflict(node.state) + node.path_cost
+		return self.out_of_place(node.state) + node.path_cost
+
+
+def manhattan(tiles, goal, width=3):
+	"""Manhattan distance of a list of tiles from goal, ignoring the blank."""
+	goal_square = {}
+	for square, tile in enumerate(goal):
+		goal_square[tile] = square
+	total = 0
+	for square, tile in enumerate(tiles):
+		if tile != 0:
+			row, col = divmod(square, width)
+			grow, gcol = divmod(goal_square[tile], width)
+			total += abs(row - grow) + abs(col - gcol)
+	return total
+
+def linear_conflict(tiles, goal, width=3):
+	"""The extra moves needed on top of the Manhattan distance because of
+	linear conflicts. In each row, the tiles that belong in that row but are
+	out of order relative to each other have to step out of the row and back;
+	at least len(tiles) - (longest increasing run of goal columns) of them must
+	do so, for 2 moves each. Columns are handled the same way."""
+	goal_square = {}
+	for square, tile in enumerate(goal):
+		goal_square[tile] = square
+	extra = 0
+	for line in range(width):
+		row_goals = []
+		col_goals = []
+		for i in range(width):
+			tile = tiles[line * width + i]
+			if tile != 0 and goal_square[tile] // width == line:
+				row_goals.append(goal_square[tile] % width)
+			tile = tiles[i * width + line]
+			if tile != 0 and goal_square[tile] % width == line:
+				col_goals.append(goal_square[tile] // width)
+		extra += 2 * (len(row_goals) - _longest_increasing(row_goals))
+		extra += 2 * (len(col_goals) - _longest_increasing(col_goals))
+	return extra
+
+def _longest_increasing(values):
+	best = [1] * len(values)
+	for i in range(len(values)):
+		for j in range(i):
+			if values[j] < values[i] and best[j] + 1 > best[i]:
+				best[i] = best[j] + 1
+	return max(best) if best else 0
 		
 
 
@@ -199,7 +304,13 @@ class Node:
 	the same state.  Also includes the action that got us to this state, and
 	the total path_cost (also known as g) to reach the node.  Other functions
 	may add an f and h value. You will not need to
-	subclass this class."""
+	subclass this class.
+
+	Nodes use __slots__ instead of a per-instance __dict__, which makes them
+	smaller and faster to create; searches that keep extra bookkeeping on
+	their nodes subclass Node with their own slots."""
+
+	__slots__ = ('state', 'parent', 'action', 'path_cost', 'depth', 'f', 'h')
 
 	def __init__(self, state, parent=None, action=None, path_cost=0):
 		"Create a search tree Node, derived from a parent by an action."
@@ -209,11 +320,11 @@ class Node:
 		self.path_cost = path_cost
 		self.depth = 0
 		
-		if parent:
+		if parent is not None:
 			self.depth = parent.depth + 1
 			
 	def __str__(self):
-		return "<Node " + self.state + ">"
+		return "<Node " + str(self.state) + ">"
 	
 	def path(self):
 		"Create a list of nodes from the root to this node."
@@ -225,93 +336,973 @@ class Node:
 
 	def expand(self, problem):
 		"Return a list of nodes reachable from this node. [Fig. 3.8]"
-		return [Node(next, self, act,
-					 problem.path_cost(self.path_cost, self.state, act, next))
-				for (act, next) in problem.successor(self.state)]
+		return list(self.iter_expand(problem))
+
+	def iter_expand(self, problem):
+		"""Yield the nodes reachable from this node one at a time, for
+		searches that don't need them all at once. Children are the same
+		class as this node."""
+		cls = type(self)
+		for (act, next, cost) in problem.transitions(self.state):
+			yield cls(next, self, act, self.path_cost + cost)
 
 #______________________________________________________________________________
 ## Uninformed Search algorithms
 
-def breadth_first_search(problem):
+# If given a stats dict, the searches fill in stats["max_frontier"], the most
+# nodes that were waiting in the frontier at once, and stats["duplicates"],
+# the number of times a state was found again and skipped
+
+def _report(stats, **values):
+	if stats is not None:
+		stats.update(values)
+
+def breadth_first_search(problem, stats=None):
 	frontier = structs.Queue()
-	frontier.put(Node(problem.initial))
-	visited = []
+	init_node = Node(problem.initial)
+	frontier.put(init_node)
+	in_frontier = {problem.key(init_node.state)}	# Keys of states waiting in the frontier
+	visited = set()
 	nodes_visited = 0
+	duplicates = 0
 
 	while not frontier.empty():
 		curr_node = frontier.get()
+		curr_key = problem.key(curr_node.state)
+		in_frontier.discard(curr_key)
 
 		#print("Now visiting: " + str(curr_node))
 		nodes_visited += 1
 
 		if problem.goal_test(curr_node.state):
+			_report(stats, max_frontier=frontier.max_size, duplicates=duplicates)
 			return curr_node, nodes_visited, curr_node.path_cost
-		if (curr_node.state not in visited):
-			visited.append(curr_node.state)
+		if curr_key not in visited:
+			visited.add(curr_key)
 
-			neighbors = sorted(curr_node.expand(problem), key=lambda x: x.state)
-
-			for node in neighbors:
+			for node in curr_node.iter_expand(problem):
 				if problem.goal_test(node.state):
+					_report(stats, max_frontier=frontier.max_size, duplicates=duplicates)
 					return node, nodes_visited, node.path_cost
-				if node.state not in visited and node not in frontier.elements:
+				key = problem.key(node.state)
+				if key not in visited and key not in in_frontier:
 					frontier.put(node)
+					in_frontier.add(key)
+				else:
+					duplicates += 1
 
-			
-	
-def depth_first_search(problem):
+	_report(stats, max_frontier=frontier.max_size, duplicates=duplicates)
+
+
+def depth_first_search(problem, stats=None):
 	frontier = structs.Stack()
 	frontier.push(Node(problem.initial))
-	visited = []
+	visited = set()
 	nodes_visited = 0
+	duplicates = 0
 
 	while not frontier.empty():
 		curr_node = frontier.pop()
+		curr_key = problem.key(curr_node.state)
 
 		#print("Now visiting: " + str(curr_node))
 		nodes_visited += 1
 
 		if problem.goal_test(curr_node.state):
+			_report(stats, max_frontier=frontier.max_size, duplicates=duplicates)
 			return curr_node, nodes_visited, curr_node.path_cost
-		if (curr_node.state not in visited):
-			visited.append(curr_node.state)
+		if curr_key not in visited:
+			visited.add(curr_key)
 			
-			neighbors = curr_node.expand(problem)[::-1]
+			neighbors = reversed(curr_node.expand(problem))
 
 			for node in neighbors:
-				if node.state not in visited:
+				if problem.key(node.state) not in visited:
 					frontier.push(node)
+				else:
+					duplicates += 1
+		else:
+			duplicates += 1
 
+	_report(stats, max_frontier=frontier.max_size, duplicates=duplicates)
 
 #______________________________________________________________________________
 # Informed (Heuristic) Search
-
-def astar_search(problem):
-	frontier = structs.PriorityQueue()
+#
+# One loop for uniform-cost, greedy and A* search, ordering nodes by
+# g_weight * path cost + h_weight * problem.cost_to_go(node). The frontier is
+# an IndexedPriorityQueue keyed by state, so a cheaper path to a queued state
+# lowers its priority in place and the frontier never holds more than one
+# entry per state. Ties on f go to the lower h, which is closer to the goal,
+# then to the lower path cost and then to insertion order.
+#
+# early_goal_test returns a goal as soon as it is generated rather than when
+# it is expanded. It saves the last layer of expansions, but the path is only
+# guaranteed cheapest when every step costs the same and h_weight is 0.
+# reopen puts expanded states back on the frontier when a cheaper path to
+# them turns up. That is needed for A* to be optimal with an inconsistent
+# heuristic such as pattern databases, and can be switched off otherwise.
+
+def best_first_search(problem, g_weight=1, h_weight=1, early_goal_test=False,
+					  reopen=True, stats=None):
+	"""Returns (node, nodes_visited, cost) like astar_search, and fills in
+	stats with max_frontier, duplicates, reopened and decrease_keys (cheaper
+	paths found to states already on the frontier)."""
 	init_node = Node(problem.initial)
-	frontier.put(init_node, problem.h(init_node))
-	visited = []
+	best = {problem.key(init_node.state): 0}	# Cheapest path cost found to each state
+	expanded = set()
+	cost_to_go = problem.cost_to_go
+
+	frontier = structs.IndexedPriorityQueue()
+	h = cost_to_go(init_node) if h_weight else 0
+	frontier.put(problem.key(init_node.state), init_node, (h_weight * h, h, 0))
 	nodes_visited = 0
+	duplicates = 0
+	reopened = 0
+
+	def finish(node):
+		_report(stats, max_frontier=frontier.stats["max_size"], duplicates=duplicates,
+				reopened=reopened, decrease_keys=frontier.stats["decrease_keys"])
+		if node is None:
+			print("Not Found")
+			return None
+		return node, nodes_visited, node.path_cost
+
+	if early_goal_test and problem.goal_test(init_node.state):
+		return finish(init_node)
 
 	while not frontier.empty():
 		curr_node = frontier.get()
+		nodes_visited += 1
+		if not early_goal_test and problem.goal_test(curr_node.state):
+			return finish(curr_node)
+		expanded.add(problem.key(curr_node.state))
+
+		for node in curr_node.iter_expand(problem):
+			key = problem.key(node.state)
+			if key in best and node.path_cost >= best[key]:
+				duplicates += 1
+				continue
+			if key in expanded:
+				if not reopen:
+					duplicates += 1
+					continue
+				expanded.discard(key)
+				reopened += 1
+			best[key] = node.path_cost
+			if early_goal_test and problem.goal_test(node.state):
+				return finish(node)
+			h = cost_to_go(node) if h_weight else 0
+			# The path is cheaper, so with the same h this always lowers the priority
+			frontier.put(key, node, (g_weight * node.path_cost + h_weight * h, h, node.path_cost))
+
+	return finish(None)
+
+def uniform_cost_search(problem, early_goal_test=False, stats=None):
+	"""Dijkstra's algorithm on the problem's implicit graph: expands states in
+	order of path cost and never evaluates the heuristic."""
+	return best_first_search(problem, 1, 0, early_goal_test, False, stats)
+
+def astar_search(problem, stats=None):
+	return best_first_search(problem, 1, 1, stats=stats)
+
+def greedy_best_first_search(problem, stats=None):
+	"""Expands the state that looks closest to the goal. Quick, but the path
+	it finds is not necessarily the cheapest."""
+	return best_first_search(problem, 0, 1, stats=stats)
+
+def weighted_astar_search(problem, weight=2.0, stats=None):
+	"""A* with the heuristic inflated by weight, which finds a path costing at
+	most weight times the cheapest when the heuristic is consistent."""
+	return best_first_search(problem, 1, weight, stats=stats)
 
-		#print("Now visiting: " + str(curr_node))
-		nodes_visited +=1
+#______________________________________________________________________________
+# Memory-Bounded Heuristic Search
+#
+# These order nodes by problem.h(node), as astar_search does, and keep only a
+# path or a capped number of nodes in memory. They return
+# (node, nodes_visited, cost, stats), where stats["peak_nodes"] is the most
+# nodes held at once and stats["duplicates"] counts children skipped because
+# their state was already on the path. A stats dict can be passed in to be
+# filled instead.
+
+def iterative_deepening_astar(problem, stats=None):
+	"""IDA*: depth-first searches that cut off at an f bound, raised each
+	iteration to the smallest f that exceeded it. Only the current path is
+	stored, and states already on it are skipped."""
+	root = Node(problem.initial)
+	bound = problem.h(root)
+	path = {problem.key(root.state)}
+	if stats is None:
+		stats = {}
+	stats.update({"peak_nodes": 1, "iterations": 0, "duplicates": 0})
+	nodes_visited = 0
+
+	def search_bound(node, bound):
+		nonlocal nodes_visited
+		f = problem.h(node)
+		if f > bound:
+			return None, f
+		nodes_visited += 1
+		if problem.goal_test(node.state):
+			return node, f
+		minimum = float("inf")
+		for child in node.iter_expand(problem):
+			key = problem.key(child.state)
+			if key in path:
+				stats["duplicates"] += 1
+				continue
+			path.add(key)
+			stats["peak_nodes"] = max(stats["peak_nodes"], len(path))
+			found, t = search_bound(child, bound)
+			path.discard(key)
+			if found is not None:
+				return found, t
+			minimum = min(minimum, t)
+		return None, minimum
+
+	while True:
+		stats["iterations"] += 1
+		found, bound = search_bound(root, bound)
+		if found is not None:
+			return found, nodes_visited, found.path_cost, stats
+		if bound == float("inf"):
+			print("Not Found")
+			return None
+
+def recursive_best_first_search(problem, stats=None):
+	"""RBFS [Fig. 3.26]: best-first search in linear space. Each call
+	remembers the f of the best alternative path and unwinds once its own
+	subtree gets worse, backing the subtree's best f up into node.f."""
+	root = Node(problem.initial)
+	root.f = problem.h(root)
+	path = {problem.key(root.state)}
+	if stats is None:
+		stats = {}
+	stats.update({"peak_nodes": 1, "duplicates": 0})
+	nodes_visited = 0
 
+	def rbfs(node, flimit, held):
+		nonlocal nodes_visited
+		nodes_visited += 1
+		if problem.goal_test(node.state):
+			return node, node.f
+		children = list(node.iter_expand(problem))
+		successors = [child for child in children
+					  if problem.key(child.state) not in path]
+		stats["duplicates"] += len(children) - len(successors)
+		if not successors:
+			return None, float("inf")
+		held += len(successors)
+		stats["peak_nodes"] = max(stats["peak_nodes"], held)
+		for child in successors:
+			child.f = max(problem.h(child), node.f)
+		while True:
+			successors.sort(key=lambda x: x.f)
+			best = successors[0]
+			# Every successor is a dead end once the best f is infinite
+			if best.f > flimit or best.f == float("inf"):
+				return None, best.f
+			alternative = successors[1].f if len(successors) > 1 else float("inf")
+			key = problem.key(best.state)
+			path.add(key)
+			result, best.f = rbfs(best, min(flimit, alternative), held)
+			path.discard(key)
+			if result is not None:
+				return result, best.f
+
+	found, f = rbfs(root, float("inf"), 1)
+	if found is None:
+		print("Not Found")
+		return None
+	return found, nodes_visited, found.path_cost, stats
+
+class SMANode(Node):
+	"A Node with the bookkeeping sma_star_search keeps on its tree."
+	__slots__ = ('children', 'forgotten', 'expanded', 'open_entry', 'leaf_entry')
+
+
+def sma_star_search(problem, max_nodes=10000, stats=None):
+	"""Simplified memory-bounded A*. Best-first like A*, but with at most
+	max_nodes nodes in memory. When it is full, the worst leaf (highest f,
+	shallowest) is dropped and its f is remembered by its parent, which stays
+	on the frontier with that f so the dropped branch can be regenerated if
+	it turns out to be the best again. The result is optimal if the optimal
+	path fits in memory."""
+	root = SMANode(problem.initial)
+	if stats is None:
+		stats = {}
+	stats.update({"peak_nodes": 1, "dropped": 0, "duplicates": 0})
+	nodes_visited = 0
+	memory = 1
+	counter = itertools.count()
+
+	# The frontier holds nodes that are unexpanded or have forgotten
+	# children, the drop heap holds leaves. Entries go stale when a node's
+	# value changes, which node.open_entry and node.leaf_entry detect
+	frontier = []
+	drop_heap = []
+
+	def make_node(node, f):
+		node.f = f
+		node.children = {}		# Key of each child in memory to the child
+		node.forgotten = {}		# Key of each dropped child to its f
+		node.expanded = False
+		node.open_entry = node.leaf_entry = None
+		push_open(node, f)
+		push_leaf(node)
+
+	def push_open(node, f):
+		node.open_entry = next(counter)
+		heapq.heappush(frontier, (f, -node.depth, node.open_entry, node))
+
+	def push_leaf(node):
+		node.leaf_entry = next(counter)
+		heapq.heappush(drop_heap, (-node.f, node.depth, node.leaf_entry, node))
+
+	def remove(node):
+		"Takes a leaf out of the tree, leaving its f with its parent."
+		nonlocal memory
+		parent = node.parent
+		key = problem.key(node.state)
+		del parent.children[key]
+		parent.forgotten[key] = node.f
+		node.open_entry = node.leaf_entry = None
+		memory -= 1
+		push_open(parent, min(parent.forgotten.values()))
+		if not parent.children:
+			parent.f = min(parent.forgotten.values())
+			push_leaf(parent)
+
+	make_node(root, problem.h(root))
+
+	while frontier:
+		(f, depth, entry, node) = heapq.heappop(frontier)
+		if entry != node.open_entry:
+			continue
+		if f == float("inf"):
+			break
+		node.open_entry = None
+
+		if not node.expanded:
+			nodes_visited += 1
+			if problem.goal_test(node.state):
+				return node, nodes_visited, node.path_cost, stats
+
+		on_path = set()
+		x = node
+		while x is not None:
+			on_path.add(problem.key(x.state))
+			x = x.parent
+
+		# Generates the children that were never kept or have been dropped.
+		# Children are keyed by state, so of several steps to the same state
+		# only the cheapest is kept
+		generated = {}
+		for child in node.iter_expand(problem):
+			key = problem.key(child.state)
+			if key in on_path:
+				stats["duplicates"] += 1
+			elif key not in node.children:
+				if key in generated:
+					stats["duplicates"] += 1
+					if generated[key].path_cost <= child.path_cost:
+						continue
+				generated[key] = child
+		children = []
+		for (key, child) in generated.items():
+			child.f = max(problem.h(child), node.f, node.forgotten.get(key, 0))
+			children.append(child)
+		node.expanded = True
+
+		if not children and not node.children:
+			# A dead end is worth nothing to its parent
+			node.f = float("inf")
+			if node.parent is None:
+				break
+			remove(node)
+			continue
+
+		# Makes room by dropping the worst leaves elsewhere in the tree, and
+		# only keeps the best children if that isn't enough
+		children.sort(key=lambda x: x.f)
+		while memory + len(children) > max_nodes and drop_heap:
+			(f, depth, entry, worst) = heapq.heappop(drop_heap)
+			if entry != worst.leaf_entry or worst is node or worst.parent is None:
+				continue
+			stats["dropped"] += 1
+			remove(worst)
+		room = max(0, max_nodes - memory)
+		if room == 0 and not node.children:
+			print("Not Found: max_nodes is too small")
+			return None
+
+		for child in children[:room]:
+			key = problem.key(child.state)
+			node.forgotten.pop(key, None)
+			node.children[key] = child
+			memory += 1
+			make_node(child, child.f)
+		for child in children[room:]:
+			node.forgotten[problem.key(child.state)] = child.f
+		if node.forgotten:
+			push_open(node, min(node.forgotten.values()))
+		if not node.children:
+			node.f = min(node.forgotten.values())
+			push_leaf(node)
+		else:
+			node.leaf_entry = None
+		stats["peak_nodes"] = max(stats["peak_nodes"], memory)
+
+	print("Not Found")
+	return None
+
+#______________________________________________________________________________
+# Beam and Bounded-Frontier Search
+#
+# Both keep at most a fixed number of nodes on the frontier, chosen by
+# g_weight * path cost + h_weight * problem.cost_to_go(node) as in
+# best_first_search, and throw the rest away. Memory and time per step are
+# bounded whatever the branching factor, but a path through a discarded node
+# is lost, so neither is complete or optimal. The best k are picked with
+# heapq.nsmallest, a partial selection that only keeps a heap of k.
+
+def beam_search(problem, beam_width=64, g_weight=1, h_weight=1, stats=None):
+	"""Breadth-first search that keeps only the beam_width best nodes of each
+	layer. States kept in an earlier layer are not kept again. Returns
+	(node, nodes_visited, cost) and fills in stats with max_frontier,
+	duplicates, dropped and layers."""
+	init_node = Node(problem.initial)
+	seen = {problem.key(init_node.state)}
+	beam = [init_node]
+	counter = itertools.count()
+	nodes_visited = 0
+	duplicates = 0
+	dropped = 0
+	layers = 0
+	peak = 1
+
+	def finish(node):
+		_report(stats, max_frontier=peak, duplicates=duplicates,
+				dropped=dropped, layers=layers)
+		if node is None:
+			print("Not Found")
+			return None
+		return node, nodes_visited, node.path_cost
+
+	if problem.goal_test(init_node.state):
+		return finish(init_node)
+
+	while beam:
+		layers += 1
+		candidates = {}		# Key to the cheapest node for it in this layer
+		for curr_node in beam:
+			nodes_visited += 1
+			for node in curr_node.iter_expand(problem):
+				key = problem.key(node.state)
+				if key in seen or (key in candidates and candidates[key].path_cost <= node.path_cost):
+					duplicates += 1
+					continue
+				candidates[key] = node
+
+		goals = [node for node in candidates.values() if problem.goal_test(node.state)]
+		if goals:
+			return finish(min(goals, key=lambda node: node.path_cost))
+
+		scored = ((g_weight * node.path_cost + (h_weight * problem.cost_to_go(node) if h_weight else 0),
+				   next(counter), node) for node in candidates.values())
+		beam = [entry[2] for entry in heapq.nsmallest(beam_width, scored)]
+		dropped += len(candidates) - len(beam)
+		peak = max(peak, len(beam))
+		for node in beam:
+			seen.add(problem.key(node.state))
+
+	return finish(None)
+
+def bounded_best_first_search(problem, max_frontier=10000, g_weight=1, h_weight=1, stats=None):
+	"""best_first_search with the frontier cut back to its max_frontier best
+	nodes whenever it doubles past that. States whose only node was dropped
+	can be reached again later. Returns (node, nodes_visited, cost) and fills
+	in stats with max_frontier, duplicates, dropped and prunes."""
+	init_node = Node(problem.initial)
+	best = {problem.key(init_node.state): 0}	# Cheapest path cost queued or expanded for each state
+	expanded = set()
+	counter = itertools.count()
+	heappush, heappop = heapq.heappush, heapq.heappop
+	cost_to_go = problem.cost_to_go
+
+	h = cost_to_go(init_node) if h_weight else 0
+	frontier = [(h_weight * h, h, next(counter), init_node)]
+	nodes_visited = 0
+	duplicates = 0
+	dropped = 0
+	prunes = 0
+	peak = 1
+
+	while frontier:
+		curr_node = heappop(frontier)[3]
+		key = problem.key(curr_node.state)
+		if key in expanded or curr_node.path_cost > best[key]:
+			continue
+		nodes_visited += 1
 		if problem.goal_test(curr_node.state):
+			_report(stats, max_frontier=peak, duplicates=duplicates,
+					dropped=dropped, prunes=prunes)
 			return curr_node, nodes_visited, curr_node.path_cost
-		if (curr_node.state not in visited):
-			visited.append(curr_node.state)
-			
-			neighbors = sorted(curr_node.expand(problem), key=lambda x: x.state)
+		expanded.add(key)
+
+		for node in curr_node.iter_expand(problem):
+			key = problem.key(node.state)
+			if key in expanded or (key in best and node.path_cost >= best[key]):
+				duplicates += 1
+				continue
+			best[key] = node.path_cost
+			h = cost_to_go(node) if h_weight else 0
+			heappush(frontier, (g_weight * node.path_cost + h_weight * h, h, next(counter), node))
+		peak = max(peak, len(frontier))
+
+		if len(frontier) > 2 * max_frontier:
+			kept = heapq.nsmallest(max_frontier, frontier)
+			kept_ids = {id(entry[3]) for entry in kept}
+			for entry in frontier:
+				node = entry[3]
+				if id(node) not in kept_ids:
+					key = problem.key(node.state)
+					if best.get(key) == node.path_cost and key not in expanded:
+						del best[key]
+			dropped += len(frontier) - len(kept)
+			prunes += 1
+			frontier = kept		# A sorted list is already a heap
+
+	_report(stats, max_frontier=peak, duplicates=duplicates, dropped=dropped, prunes=prunes)
+	print("Not Found")
+	return None
 
-			for node in neighbors:
-				if node.state not in visited:
-					#print(node.state, problem.h(node), node.path_cost)
-					frontier.put(node, problem.h(node))
+#______________________________________________________________________________
+# Anytime Search
+#
+# ARA* (Likhachev, Gordon and Thrun): a weighted A* that orders nodes by
+# g + weight * h, so it finds a path quickly whose cost is at most weight times
+# the optimal, then lowers the weight and repairs the search, reusing what it
+# has already expanded, to find better paths until the weight reaches 1 or
+# time runs out. h is problem.cost_to_go(node).
+
+def ara_star_solutions(problem, weight=3.0, decrement=0.5, deadline=None, stats=None):
+	"""Yields (node, nodes_visited, cost, bound) each time a better path is
+	found, where cost is at most bound times the optimal cost. deadline is a
+	time.perf_counter() value after which the search gives up. The bound is
+	only guaranteed for consistent heuristics."""
+	if stats is None:
+		stats = {}
+	stats.update({"max_frontier": 0, "duplicates": 0, "iterations": 0,
+				  "bound": float("inf"), "solutions": []})
+	start_time = time.perf_counter()
 
-	print("Not Found")
+	init_node = Node(problem.initial)
+	init_node.f = problem.cost_to_go(init_node)	# h is kept on the node as f
+	best = {problem.key(init_node.state): init_node}	# Cheapest node found for each state
+	frontier = structs.IndexedPriorityQueue()
+	frontier.put(problem.key(init_node.state), init_node, weight * init_node.f)
+	closed = set()
+	inconsistent = {}	# Closed states whose path cost dropped during this pass
+	incumbent = init_node if problem.goal_test(init_node.state) else None
+	nodes_visited = 0
+
+	while True:
+		stats["iterations"] += 1
+		# Expand until nothing on the frontier could lead to a cheaper goal
+		while not frontier.empty() and (incumbent is None or
+										incumbent.path_cost > frontier.min_priority()):
+			if deadline is not None and time.perf_counter() > deadline:
+				stats["max_frontier"] = max(stats["max_frontier"], frontier.stats["max_size"])
+				return
+			curr_node = frontier.get()
+			nodes_visited += 1
+			closed.add(problem.key(curr_node.state))
+
+			for node in curr_node.iter_expand(problem):
+				key = problem.key(node.state)
+				if key in best and best[key].path_cost <= node.path_cost:
+					stats["duplicates"] += 1
+					continue
+				node.f = problem.cost_to_go(node)
+				best[key] = node
+				if problem.goal_test(node.state) and (incumbent is None or
+													  node.path_cost < incumbent.path_cost):
+					incumbent = node
+				if key in closed:
+					inconsistent[key] = node
+				else:
+					frontier.put(key, node, node.path_cost + weight * node.f)
+		stats["max_frontier"] = max(stats["max_frontier"], frontier.stats["max_size"])
+
+		if incumbent is None:
+			print("Not Found")
+			return
+
+		# Every path cheaper than the incumbent passes through a node that is
+		# still open or inconsistent, so the lowest g + h among them bounds it
+		waiting = [entry[3] for entry in frontier.elements] + list(inconsistent.values())
+		lowest = min((node.path_cost + node.f for node in waiting), default=incumbent.path_cost)
+		if incumbent.path_cost <= lowest:
+			bound = 1.0		# Nothing waiting can lead to a cheaper path, even at cost 0
+		else:
+			bound = max(min(weight, incumbent.path_cost / lowest) if lowest > 0 else weight, 1.0)
+		if not stats["solutions"] or incumbent.path_cost < stats["solutions"][-1]["cost"] \
+				or bound < stats["bound"]:
+			stats["bound"] = bound
+			stats["solutions"].append({"cost": incumbent.path_cost, "bound": bound,
+									   "weight": weight, "nodes_visited": nodes_visited,
+									   "time": time.perf_counter() - start_time})
+			yield incumbent, nodes_visited, incumbent.path_cost, bound
+		if bound <= 1.0 or weight <= 1.0:
+			return
+
+		# Lower the weight, reopen the inconsistent states and re-sort the frontier
+		weight = max(1.0, weight - decrement)
+		waiting = [entry[3] for entry in frontier.elements] + list(inconsistent.values())
+		frontier = structs.IndexedPriorityQueue()
+		for node in waiting:
+			frontier.put(problem.key(node.state), node, node.path_cost + weight * node.f)
+		inconsistent = {}
+		closed = set()
+
+def ara_star_search(problem, weight=3.0, decrement=0.5, time_limit=None, stats=None):
+	"""Runs ARA* for at most time_limit seconds and returns the best path
+	found as (node, nodes_visited, cost, stats), where stats["bound"] is how
+	far from optimal its cost may be and stats["solutions"] records each
+	improvement. Returns None if no path was found in time."""
+	if stats is None:
+		stats = {}
+	deadline = None if time_limit is None else time.perf_counter() + time_limit
+	result = None
+	for result in ara_star_solutions(problem, weight, decrement, deadline, stats):
+		pass
+	if result is None:
+		if deadline is not None and time.perf_counter() > deadline:
+			print("Not Found")
+		return None
+	return result[0], result[1], result[2], stats
+
+#______________________________________________________________________________
+# Shortest Paths
+
+def dijkstra(graph, source):
+	"""Single-source shortest paths over a Graph. Returns a dict of the
+	cost from source to every reachable state."""
+	return shortest_path_tree(graph, source)[0]
+
+def shortest_path_tree(graph, source):
+	"""Dijkstra from source over a Graph. Returns (dist, parent), where
+	parent maps every reachable state to its predecessor on a shortest path
+	from source (None for source itself)."""
+	frontier = structs.IndexedPriorityQueue()
+	frontier.put(source, source, 0)
+	dist = {source: 0}
+	parent = {source: None}
+	visited = set()
+
+	while not frontier.empty():
+		state = frontier.get()
+		visited.add(state)
+		for (next, cost) in graph.edges.get(state, ()):
+			if next in visited:
+				continue
+			g = dist[state] + cost
+			if g < dist.get(next, float("inf")):
+				dist[next] = g
+				parent[next] = state
+				frontier.put(next, next, g)
+	return dist, parent
+
+def tree_path(parent, state):
+	"Returns the list of states from the root of a shortest path tree to state."
+	result = []
+	while state is not None:
+		result.append(state)
+		state = parent[state]
+	return result[::-1]
+
+#______________________________________________________________________________
+# Bidirectional Search
+
+def bidirectional_ucs(problem, stats=None):
+	"""Uniform-cost search run from both problem.initial and problem.goal over
+	problem.map at once. Returns (node, nodes_visited, cost, stats) where
+	stats["forward"] and stats["backward"] count the nodes expanded by the two
+	halves. A stats dict can be passed in to be filled instead."""
+	return bidirectional_search(problem, lambda state: 0, stats)
+
+def bidirectional_astar(problem, estimate=None, stats=None):
+	"""Bidirectional A* using the average of the front-to-end heuristics
+	estimate(state, goal) and estimate(initial, state) as a potential. If the
+	estimate is consistent, the result is optimal. Defaults to
+	problem.estimate."""
+	if estimate is None:
+		estimate = problem.estimate
+	start, goal = problem.initial, problem.goal
+	return bidirectional_search(problem,
+		lambda state: (estimate(state, goal) - estimate(start, state)) / 2, stats)
+
+def _step_action(problem, state, next, cost):
+	"The action of the transition from state to next that costs cost."
+	for (action, other, step_cost) in problem.transitions(state):
+		if other == next and step_cost == cost:
+			return action
+
+def bidirectional_search(problem, potential, stats=None):
+	"""Bidirectional Dijkstra over problem.map with edge costs reduced by
+	potential; the backward search uses the negated potential. The search stops
+	once the smallest keys of the two frontiers add up to at least the best
+	path found, which can then no longer be improved."""
+	start, goal = problem.initial, problem.goal
+	if stats is None:
+		stats = {}
+	stats.update({"forward": 0, "backward": 0, "generated": 0, "max_frontier": 1, "duplicates": 0})
+	if start == goal:
+		return Node(start), 0, 0, stats
+
+	graphs = (problem.map, problem.map.reverse())
+	signs = (1, -1)
+	dist = ({start: 0}, {goal: 0})
+	parent = ({start: None}, {goal: None})		# State to (previous state, action, edge cost)
+	visited = (set(), set())
+	frontiers = (structs.IndexedPriorityQueue(), structs.IndexedPriorityQueue())
+	frontiers[0].put(start, start, potential(start))
+	frontiers[1].put(goal, goal, -potential(goal))
+	expansions = [0, 0]
+	best_cost = float("inf")
+	meeting = None
+
+	while not frontiers[0].empty() and not frontiers[1].empty():
+		if frontiers[0].min_priority() + frontiers[1].min_priority() >= best_cost:
+			break
+
+		# Expand the side with the smaller frontier to keep the two balanced
+		d = 0 if len(frontiers[0]) <= len(frontiers[1]) else 1
+		state = frontiers[d].get()
+		visited[d].add(state)
+		expansions[d] += 1
+
+		# Forward steps come from transitions() so their actions are known.
+		# Backward ones follow the reversed map, and get theirs at the end.
+		if d == 0:
+			steps = problem.transitions(state)
+		else:
+			steps = ((None, next, cost) for (next, cost) in graphs[1].edges.get(state, ()))
+		for (action, next, cost) in steps:
+			stats["generated"] += 1
+			if next in visited[d]:
+				stats["duplicates"] += 1
+				continue
+			g = dist[d][state] + cost
+			if g < dist[d].get(next, float("inf")):
+				dist[d][next] = g
+				parent[d][next] = (state, action, cost)
+				frontiers[d].put(next, next, g + signs[d] * potential(next))
+			if next in dist[1 - d] and dist[d][next] + dist[1 - d][next] < best_cost:
+				best_cost = dist[d][next] + dist[1 - d][next]
+				meeting = next
+
+	stats["forward"], stats["backward"] = expansions
+	stats["max_frontier"] = frontiers[0].stats["max_size"] + frontiers[1].stats["max_size"]
+	stats["duplicates"] += frontiers[0].stats["ignored"] + frontiers[1].stats["ignored"]
+	if meeting is None:
+		print("Not Found")
+		return None
+
+	# Walks back to the start for the first half of the path, then follows
+	# the backward search's parents from the meeting point to the goal
+	forward_steps = []
+	state = meeting
+	while parent[0][state]:
+		(previous, action, cost) = parent[0][state]
+		forward_steps.append((action, state))
+		state = previous
+	node = Node(start)
+	for (action, state) in reversed(forward_steps):
+		node = Node(state, node, action, dist[0][state])
+	state = meeting
+	while parent[1][state]:
+		(next, _, cost) = parent[1][state]
+		action = _step_action(problem, state, next, cost)
+		node = Node(next, node, action, node.path_cost + cost)
+		state = next
+
+	nodes_visited = expansions[0] + expansions[1]
+	return node, nodes_visited, node.path_cost, stats
+
+#______________________________________________________________________________
+# Instrumentation
+
+class InstrumentedProblem(Problem):
+	"""Wraps a problem to count and time the calls a search makes to it.
+	Expansions are calls to successor or transitions, and generated nodes are
+	the successors they produce. The searches take step costs from
+	transitions, so the time spent costing steps is part of successor_time.
+	Everything else is passed through to the wrapped problem."""
+
+	def __init__(self, problem):
+		self.problem = problem
+		self.expanded = 0
+		self.generated = 0
+		self.goal_tests = 0
+		self.h_evals = 0
+		self.successor_time = 0.0
+		self.h_time = 0.0
+
+	def __getattr__(self, attr):
+		return getattr(self.problem, attr)
+
+	def successor(self, state):
+		start_time = time.perf_counter()
+		result = list(self.problem.successor(state))
+		self.successor_time += time.perf_counter() - start_time
+		self.expanded += 1
+		self.generated += len(result)
+		return result
+
+	# Times each step of the wrapped generator, so successors are still
+	# produced one at a time
+	def transitions(self, state):
+		self.expanded += 1
+		transitions = iter(self.problem.transitions(state))
+		while True:
+			start_time = time.perf_counter()
+			try:
+				transition = next(transitions)
+			except StopIteration:
+				self.successor_time += time.perf_counter() - start_time
+				return
+			self.successor_time += time.perf_counter() - start_time
+			self.generated += 1
+			yield transition
+
+	def goal_test(self, state):
+		self.goal_tests += 1
+		return self.problem.goal_test(state)
+
+	def path_cost(self, c, state1, action, state2):
+		return self.problem.path_cost(c, state1, action, state2)
+
+	def h(self, node):
+		start_time = time.perf_counter()
+		result = self.problem.h(node)
+		self.h_time += time.perf_counter() - start_time
+		self.h_evals += 1
+		return result
+
+	def cost_to_go(self, node):
+		start_time = time.perf_counter()
+		result = self.problem.cost_to_go(node)
+		self.h_time += time.perf_counter() - start_time
+		self.h_evals += 1
+		return result
+
+	def key(self, state):
+		return self.problem.key(state)
+
+	def record(self):
+		return {"expanded": self.expanded, "generated": self.generated,
+				"goal_tests": self.goal_tests, "h_evals": self.h_evals,
+				"successor_time": self.successor_time, "h_time": self.h_time}
+
+
+def instrumented_search(search_function, problem, **kwargs):
+	"""Runs search_function on problem and returns (result, record), where
+	record is a flat dict of everything measured: the problem's counters and
+	timings, the stats the search reports (max frontier, duplicates, ...),
+	nodes visited, cost and total wall time."""
+	instrumented = InstrumentedProblem(problem)
+	stats = {}
+	start_time = time.perf_counter()
+	result = search_function(instrumented, stats=stats, **kwargs)
+	elapsed = time.perf_counter() - start_time
+
+	record = {"algorithm": search_function.__name__,
+			  "problem": type(problem).__name__,
+			  "initial": repr(problem.initial), "goal": repr(problem.goal),
+			  "solved": result is not None,
+			  "nodes_visited": result[1] if result is not None else None,
+			  "cost": result[2] if result is not None else None,
+			  "time": elapsed}
+	record.update(instrumented.record())
+	# The bidirectional searches walk the reversed map directly for the
+	# backward side, and call transitions again to find the actions of its
+	# steps, so their own counts replace the problem's
+	if "forward" in stats:
+		record["expanded"] = stats["forward"] + stats["backward"]
+		record["generated"] = stats["generated"]
+	if "max_frontier" not in stats and "peak_nodes" in stats:
+		stats["max_frontier"] = stats["peak_nodes"]
+	record.update(stats)
+	return result, record
+
+def write_records(records, file):
+	"""Writes records to an open file, one JSON object per line."""
+	for record in records:
+		file.write(json.dumps(record) + "\n")
+
+#______________________________________________________________________________
+# Heuristic Memoization
+
+class MemoizedProblem(Problem):
+	"""Wraps a problem to remember cost_to_go for the states it has seen,
+	keyed by problem.key(state), so states that are generated again skip an
+	expensive heuristic (pattern databases with linear conflicts, or the max
+	over many landmarks). At most cache_size values are kept, evicted by
+	"lru" or "clock" policy. Everything else is passed through.
+
+	Worth it when the heuristic costs more than a dict lookup and states
+	recur; for Manhattan distance on the sliding puzzles it is slower."""
+
+	def __init__(self, problem, cache_size=1 << 16, policy="lru"):
+		self.problem = problem
+		if policy == "lru":
+			self.cache = structs.LRUCache(cache_size)
+		elif policy == "clock":
+			self.cache = structs.ClockCache(cache_size)
+		else:
+			raise ValueError(str(policy)+" is not a valid cache policy")
+
+	def __getattr__(self, attr):
+		if attr == "problem":	# Not set yet while unpickling
+			raise AttributeError(attr)
+		return getattr(self.problem, attr)
+
+	def successor(self, state):
+		return self.problem.successor(state)
+
+	def transitions(self, state):
+		return self.problem.transitions(state)
+
+	def goal_test(self, state):
+		return self.problem.goal_test(state)
+
+	def path_cost(self, c, state1, action, state2):
+		return self.problem.path_cost(c, state1, action, state2)
+
+	def key(self, state):
+		return self.problem.key(state)
+
+	def cost_to_go(self, node):
+		key = self.problem.key(node.state)
+		value = self.cache.get(key)
+		if value is None:
+			value = self.problem.cost_to_go(node)
+			self.cache.put(key, value)
+		return value
+
+	def h(self, node):
+		return node.path_cost + self.cost_to_go(node)
+
+	def cache_stats(self):
+		"""The cache's hits, misses and evictions, its size and hit rate."""
+		stats = dict(self.cache.stats)
+		lookups = stats["hits"] + stats["misses"]
+		stats["size"] = len(self.cache)
+		stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+		return stats
 
 #______________________________________________________________________________
 
@@ -359,6 +1350,79 @@ def argParse(args):
 		else:
 			print("Invalid Argument: "+args[1]+" is not a valid problem")
 
+	elif args[2] in ["idastar", "rbfs", "smastar"]:
+		if args[1] == "romania":
+			problem = RomaniaProblem(args[3], "Bucharest")
+		elif args[1] == "eight":
+			problem = EightPuzzle(ast.literal_eval(args[3]), [0,1,2,3,4,5,6,7,8])
+		else:
+			print("Invalid Argument: "+args[1]+" is not a valid problem")
+			return
+
+		if args[2] == "idastar":
+			result = iterative_deepening_astar(problem)
+		elif args[2] == "rbfs":
+			result = recursive_best_first_search(problem)
+		else:
+			result = sma_star_search(problem, int(args[4]) if len(args) > 4 else 10000)
+
+		if args[1] == "romania":
+			path_list = [x.state for x in result[0].path()[::-1]]
+			print("Final Path: " + " - ".join(path_list))
+		else:
+			path_list = [x.action for x in result[0].path()[::-1]]
+			print("Final Path: " + " - ".join(path_list[1:]))
+		print("Cost:",result[2])
+		print("Nodes Visited:", result[1])
+		print("Peak Nodes:", result[3]["peak_nodes"])
+
+	elif args[2] in ["biucs", "biastar"]:
+		if args[1] == "romania":
+
+			if args[2] == "biucs":
+				result = bidirectional_ucs(RomaniaProblem(args[3], "Bucharest"))
+			else:
+				result = bidirectional_astar(RomaniaProblem(args[3], "Bucharest"))
+			path_list = [x.state for x in result[0].path()[::-1]]
+			print("Final Path: " + " - ".join(path_list))
+			print("Cost:",result[2])
+			print("Nodes Visited:", result[1])
+			print("Forward Expansions:", result[3]["forward"])
+			print("Backward Expansions:", result[3]["backward"])
+
+		else:
+			print("Invalid Argument: "+args[1]+" is not a valid problem")
+
+	elif args[2] in ["ucs", "greedy", "arastar", "beam"]:
+		if args[1] == "romania":
+			problem = RomaniaProblem(args[3], "Bucharest")
+		elif args[1] == "eight":
+			problem = EightPuzzle(ast.literal_eval(args[3]), [0,1,2,3,4,5,6,7,8])
+		else:
+			print("Invalid Argument: "+args[1]+" is not a valid problem")
+			return
+
+		if args[2] == "ucs":
+			result = uniform_cost_search(problem)
+		elif args[2] == "greedy":
+			result = greedy_best_first_search(problem)
+		elif args[2] == "beam":
+			result = beam_search(problem, int(args[4]) if len(args) > 4 else 64)
+		else:
+			time_limit = float(args[4]) if len(args) > 4 else None
+			result = ara_star_search(problem, time_limit=time_limit)
+
+		if args[1] == "romania":
+			path_list = [x.state for x in result[0].path()[::-1]]
+			print("Final Path: " + " - ".join(path_list))
+		else:
+			path_list = [x.action for x in result[0].path()[::-1]]
+			print("Final Path: " + " - ".join(path_list[1:]))
+		print("Cost:",result[2])
+		print("Nodes Visited:", result[1])
+		if args[2] == "arastar":
+			print("Suboptimality Bound:", result[3]["bound"])
+
 	elif args[2] == "astar":
 		if args[1] == "romania":
 			
@@ -408,4 +1472,5 @@ def main():
 	
 	
 
-main()
\ No newline at end of file
+if __name__ == '__main__':
+	main()
@@ -1,16 +1,20 @@
 import collections
 import heapq
+import itertools
 
 class Queue:
 	def __init__(self):
 		self.elements = collections.deque()
 		self.visited = []
+		self.max_size = 0
 	
 	def empty(self):
 		return len(self.elements) == 0
 	
 	def put(self, x):
 		self.elements.append(x)
+		if len(self.elements) > self.max_size:
+			self.max_size = len(self.elements)
 
 	def get(self):
 		return self.elements.popleft()
@@ -20,12 +24,15 @@ class Stack:
 	def __init__(self):
 		self.elements = collections.deque()
 		self.visited = []
+		self.max_size = 0
 
 	def empty(self):
 		return len(self.elements) == 0
 	
 	def push(self, x):
 		self.elements.append(x)
+		if len(self.elements) > self.max_size:
+			self.max_size = len(self.elements)
 
 	def pop(self):
 		return self.elements.pop()
@@ -34,18 +41,207 @@ class Stack:
 class PriorityQueue:
 	def __init__(self):
 		self.elements = []
+		self.counter = itertools.count()
 
 	def empty(self):
 		return len(self.elements) == 0
 
+	# Ties are broken by insertion order, so items never get compared
 	def put(self, item, priority):
-		if self.empty():
-			heapq.heappush(self.elements, (priority, item))
-		if priority != self.elements[0][0]:		# Lazy tie breaking
-			heapq.heappush(self.elements, (priority, item))
+		heapq.heappush(self.elements, (priority, next(self.counter), item))
 
 	def get(self):
-		return heapq.heappop(self.elements)[1]
+		return heapq.heappop(self.elements)[2]
+
+
+class LRUCache:
+	"""A dict of at most size entries that evicts the least recently used.
+	stats counts hits, misses and evictions."""
+
+	def __init__(self, size):
+		self.size = size
+		self.elements = collections.OrderedDict()
+		self.stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+	def __len__(self):
+		return len(self.elements)
+
+	def get(self, key, default=None):
+		value = self.elements.get(key, default)
+		if value is default and key not in self.elements:
+			self.stats["misses"] += 1
+			return default
+		self.stats["hits"] += 1
+		self.elements.move_to_end(key)
+		return value
+
+	def put(self, key, value):
+		self.elements[key] = value
+		self.elements.move_to_end(key)
+		if len(self.elements) > self.size:
+			self.elements.popitem(last=False)
+			self.stats["evictions"] += 1
+
+
+class ClockCache:
+	"""The same interface as LRUCache, approximating it with the clock
+	algorithm: a hit only sets a reference bit, and the hand sweeping for a
+	slot to reuse gives every referenced entry a second chance. Hits are
+	cheaper than reordering a list, which matters when most lookups hit.
+	A size of 0 caches nothing, like an LRUCache of size 0."""
+
+	def __init__(self, size):
+		if size < 0:
+			raise ValueError("Cache size must not be negative")
+		self.size = size
+		self.index = {}						# Key to slot
+		self.keys = [None] * size
+		self.values = [None] * size
+		self.referenced = bytearray(size)
+		self.hand = 0
+		self.stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+	def __len__(self):
+		return len(self.index)
+
+	def get(self, key, default=None):
+		slot = self.index.get(key)
+		if slot is None:
+			self.stats["misses"] += 1
+			return default
+		self.stats["hits"] += 1
+		self.referenced[slot] = 1
+		return self.values[slot]
+
+	def put(self, key, value):
+		if self.size == 0:
+			return
+		slot = self.index.get(key)
+		if slot is None:
+			if len(self.index) < self.size:
+				slot = len(self.index)
+			else:
+				while self.referenced[self.hand]:
+					self.referenced[self.hand] = 0
+					self.hand = (self.hand + 1) % self.size
+				slot = self.hand
+				self.hand = (self.hand + 1) % self.size
+				del self.index[self.keys[slot]]
+				self.stats["evictions"] += 1
+			self.index[key] = slot
+			self.keys[slot] = key
+		self.values[slot] = value
+		self.referenced[slot] = 1
+
+
+class IndexedPriorityQueue:
+	"""A binary min-heap of items identified by hashable keys. Each key appears
+	at most once: putting a key that is already queued with a lower priority
+	updates it in place (decrease-key) instead of adding a stale duplicate.
+	Ties are broken by insertion order.
+
+	The stats dict counts puts, pops, decrease-keys and the puts that were
+	ignored because they did not improve on the queued priority, i.e. the
+	stale entries a lazy-deletion queue would have accumulated."""
+
+	def __init__(self):
+		self.elements = []	# Heap of [priority, count, key, item] entries
+		self.index = {}		# Key to position in self.elements
+		self.counter = itertools.count()
+		self.stats = {"puts": 0, "pops": 0, "decrease_keys": 0,
+					  "ignored": 0, "max_size": 0}
+
+	def empty(self):
+		return len(self.elements) == 0
+
+	def __len__(self):
+		return len(self.elements)
+
+	def __contains__(self, key):
+		return key in self.index
+
+	def priority(self, key):
+		return self.elements[self.index[key]][0]
+
+	def min_priority(self):
+		return self.elements[0][0]
+
+	def put(self, key, item, priority):
+		"""Queue item under key, or lower the priority of the queued key.
+		Returns True if the queue changed."""
+		pos = self.index.get(key)
+		if pos is None:
+			self.stats["puts"] += 1
+			self.elements.append([priority, next(self.counter), key, item])
+			self.index[key] = len(self.elements) - 1
+			self._sift_up(len(self.elements) - 1)
+			if len(self.elements) > self.stats["max_size"]:
+				self.stats["max_size"] = len(self.elements)
+			return True
+		entry = self.elements[pos]
+		if priority < entry[0]:
+			self.stats["decrease_keys"] += 1
+			entry[0] = priority
+			entry[1] = next(self.counter)
+			entry[3] = item
+			self._sift_up(pos)
+			return True
+		self.stats["ignored"] += 1
+		return False
+
+	def get(self):
+		"""Remove and return the item with the lowest priority."""
+		self.stats["pops"] += 1
+		elements = self.elements
+		last = elements.pop()
+		del self.index[last[2]]
+		if not elements:
+			return last[3]
+		top = elements[0]
+		del self.index[top[2]]
+		elements[0] = last
+		self.index[last[2]] = 0
+		self._sift_down(0)
+		return top[3]
+
+	# Entries are compared whole: the counts are unique, so the comparison is
+	# always settled by the priority or the count and never reaches the key
+	def _sift_up(self, pos):
+		elements = self.elements
+		index = self.index
+		entry = elements[pos]
+		while pos > 0:
+			parent_pos = (pos - 1) >> 1
+			parent = elements[parent_pos]
+			if entry >= parent:
+				break
+			elements[pos] = parent
+			index[parent[2]] = pos
+			pos = parent_pos
+		elements[pos] = entry
+		index[entry[2]] = pos
+
+	# Like heapq, moves the smaller child up until the hole reaches a leaf and
+	# then sifts the entry up from there. The entry came from the bottom of
+	# the heap, so it rarely climbs far, and this takes about half the
+	# comparisons of stopping as soon as the entry fits.
+	def _sift_down(self, pos):
+		elements = self.elements
+		index = self.index
+		size = len(elements)
+		entry = elements[pos]
+		child_pos = 2 * pos + 1
+		while child_pos < size:
+			right_pos = child_pos + 1
+			if right_pos < size and not elements[child_pos] < elements[right_pos]:
+				child_pos = right_pos
+			child = elements[child_pos]
+			elements[pos] = child
+			index[child[2]] = pos
+			pos = child_pos
+			child_pos = 2 * pos + 1
+		elements[pos] = entry
+		self._sift_up(pos)
 		
 # Testing stuff
 if __name__ == '__main__':
@@ -64,4 +260,10 @@ if __name__ == '__main__':
 
 	pq.put("Arad", 320)
 	pq.put("Other City", 120)
-	print(pq.get())
\ No newline at end of file
+	print(pq.get())
+
+	ipq = IndexedPriorityQueue()
+	ipq.put("Arad", "Arad", 320)
+	ipq.put("Sibiu", "Sibiu", 250)
+	ipq.put("Arad", "Arad", 100)
+	print(ipq.get(), ipq.stats)
\ No newline at end of file